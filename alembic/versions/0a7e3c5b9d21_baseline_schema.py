@@ -0,0 +1,259 @@
+"""baseline schema
+
+Revision ID: 0a7e3c5b9d21
+Revises:
+Create Date: 2026-10-18 10:05:37.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7e3c5b9d21'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 迁移链建立之前 init_db 用 create_all 建立的全部表，已存在的表和索引跳过
+    op.create_table(
+        'operation_log',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('user_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('action', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('resource_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('resource_id', sa.Uuid(), nullable=True),
+        sa.Column('detail', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+        sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_operation_log_id'), 'operation_log', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_operation_log_user_id'), 'operation_log', ['user_id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'school',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column('address', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_school_id'), 'school', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_school_name'), 'school', ['name'], unique=False, if_not_exists=True)
+    op.create_table(
+        'sentence_category',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('category', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_sentence_category_category'), 'sentence_category', ['category'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_sentence_category_id'), 'sentence_category', ['id'], unique=True, if_not_exists=True)
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('email', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('nickname', sqlmodel.sql.sqltypes.AutoString(length=8), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('is_superuser', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_user_id'), 'user', ['id'], unique=True, if_not_exists=True)
+    op.create_table(
+        'class',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('grade', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+        sa.Column('school_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['school_id'], ['school.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_class_id'), 'class', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_class_name'), 'class', ['name'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_class_school_id'), 'class', ['school_id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'exam',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column('exam_date', sa.Date(), nullable=False),
+        sa.Column('exam_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+        sa.Column('school_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['school_id'], ['school.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_exam_id'), 'exam', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_exam_name'), 'exam', ['name'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_exam_school_id'), 'exam', ['school_id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'school_admin',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('school_id', sa.Uuid(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['school_id'], ['school.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_school_admin_id'), 'school_admin', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_school_admin_school_id'), 'school_admin', ['school_id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_school_admin_user_id'), 'school_admin', ['user_id'], unique=True, if_not_exists=True)
+    op.create_table(
+        'sentence_user_config',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('is_superuser', sa.Boolean(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_sentence_user_config_id'), 'sentence_user_config', ['id'], unique=True, if_not_exists=True)
+    op.create_table(
+        'sentence_content',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('is_disabled', sa.Boolean(), nullable=False),
+        sa.Column('content', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('from_source', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('from_who', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('likes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('category_id', sa.Uuid(), nullable=False),
+        sa.Column('sentence_user_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['sentence_category.id'], ),
+        sa.ForeignKeyConstraint(['sentence_user_id'], ['sentence_user_config.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_sentence_content_content'), 'sentence_content', ['content'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_sentence_content_id'), 'sentence_content', ['id'], unique=True, if_not_exists=True)
+    op.create_table(
+        'student',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('gender', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+        sa.Column('student_number', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('class_id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['class_id'], ['class.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_student_class_id'), 'student', ['class_id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_student_id'), 'student', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_student_name'), 'student', ['name'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_student_student_number'), 'student', ['student_number'], unique=True, if_not_exists=True)
+    op.create_table(
+        'score',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('student_id', sa.Uuid(), nullable=False),
+        sa.Column('exam_id', sa.Uuid(), nullable=False),
+        sa.Column('chinese', sa.Float(), nullable=True),
+        sa.Column('math', sa.Float(), nullable=True),
+        sa.Column('english', sa.Float(), nullable=True),
+        sa.Column('physics', sa.Float(), nullable=True),
+        sa.Column('history', sa.Float(), nullable=True),
+        sa.Column('chemistry', sa.Float(), nullable=True),
+        sa.Column('chemistry_assigned', sa.Float(), nullable=True),
+        sa.Column('biology', sa.Float(), nullable=True),
+        sa.Column('biology_assigned', sa.Float(), nullable=True),
+        sa.Column('politics', sa.Float(), nullable=True),
+        sa.Column('politics_assigned', sa.Float(), nullable=True),
+        sa.Column('geography', sa.Float(), nullable=True),
+        sa.Column('geography_assigned', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_score_exam_id'), 'score', ['exam_id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_score_id'), 'score', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_score_student_id'), 'score', ['student_id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'sentence_like',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('sentence_id', sa.Uuid(), nullable=False),
+        sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['sentence_id'], ['sentence_content.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_sentence_like_id'), 'sentence_like', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_sentence_like_ip_address'), 'sentence_like', ['ip_address'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_sentence_like_sentence_id'), 'sentence_like', ['sentence_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sentence_like_sentence_id'), table_name='sentence_like', if_exists=True)
+    op.drop_index(op.f('ix_sentence_like_ip_address'), table_name='sentence_like', if_exists=True)
+    op.drop_index(op.f('ix_sentence_like_id'), table_name='sentence_like', if_exists=True)
+    op.drop_table('sentence_like', if_exists=True)
+    op.drop_index(op.f('ix_score_student_id'), table_name='score', if_exists=True)
+    op.drop_index(op.f('ix_score_id'), table_name='score', if_exists=True)
+    op.drop_index(op.f('ix_score_exam_id'), table_name='score', if_exists=True)
+    op.drop_table('score', if_exists=True)
+    op.drop_index(op.f('ix_student_student_number'), table_name='student', if_exists=True)
+    op.drop_index(op.f('ix_student_name'), table_name='student', if_exists=True)
+    op.drop_index(op.f('ix_student_id'), table_name='student', if_exists=True)
+    op.drop_index(op.f('ix_student_class_id'), table_name='student', if_exists=True)
+    op.drop_table('student', if_exists=True)
+    op.drop_index(op.f('ix_sentence_content_id'), table_name='sentence_content', if_exists=True)
+    op.drop_index(op.f('ix_sentence_content_content'), table_name='sentence_content', if_exists=True)
+    op.drop_table('sentence_content', if_exists=True)
+    op.drop_index(op.f('ix_sentence_user_config_id'), table_name='sentence_user_config', if_exists=True)
+    op.drop_table('sentence_user_config', if_exists=True)
+    op.drop_index(op.f('ix_school_admin_user_id'), table_name='school_admin', if_exists=True)
+    op.drop_index(op.f('ix_school_admin_school_id'), table_name='school_admin', if_exists=True)
+    op.drop_index(op.f('ix_school_admin_id'), table_name='school_admin', if_exists=True)
+    op.drop_table('school_admin', if_exists=True)
+    op.drop_index(op.f('ix_exam_school_id'), table_name='exam', if_exists=True)
+    op.drop_index(op.f('ix_exam_name'), table_name='exam', if_exists=True)
+    op.drop_index(op.f('ix_exam_id'), table_name='exam', if_exists=True)
+    op.drop_table('exam', if_exists=True)
+    op.drop_index(op.f('ix_class_school_id'), table_name='class', if_exists=True)
+    op.drop_index(op.f('ix_class_name'), table_name='class', if_exists=True)
+    op.drop_index(op.f('ix_class_id'), table_name='class', if_exists=True)
+    op.drop_table('class', if_exists=True)
+    op.drop_index(op.f('ix_user_id'), table_name='user', if_exists=True)
+    op.drop_table('user', if_exists=True)
+    op.drop_index(op.f('ix_sentence_category_id'), table_name='sentence_category', if_exists=True)
+    op.drop_index(op.f('ix_sentence_category_category'), table_name='sentence_category', if_exists=True)
+    op.drop_table('sentence_category', if_exists=True)
+    op.drop_index(op.f('ix_school_name'), table_name='school', if_exists=True)
+    op.drop_index(op.f('ix_school_id'), table_name='school', if_exists=True)
+    op.drop_table('school', if_exists=True)
+    op.drop_index(op.f('ix_operation_log_user_id'), table_name='operation_log', if_exists=True)
+    op.drop_index(op.f('ix_operation_log_id'), table_name='operation_log', if_exists=True)
+    op.drop_table('operation_log', if_exists=True)
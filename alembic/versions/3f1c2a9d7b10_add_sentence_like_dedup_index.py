@@ -0,0 +1,39 @@
+"""add sentence_like dedup index
+
+Revision ID: 3f1c2a9d7b10
+Revises: 0a7e3c5b9d21
+Create Date: 2026-10-18 10:12:04.218311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b10'
+down_revision: Union[str, Sequence[str], None] = '0a7e3c5b9d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sentence_like_sentence_id_ip_address_created_at',
+        'sentence_like',
+        ['sentence_id', 'ip_address', 'created_at'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_sentence_like_sentence_id_ip_address_created_at',
+        table_name='sentence_like',
+        if_exists=True,
+    )
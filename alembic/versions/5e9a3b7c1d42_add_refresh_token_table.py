@@ -0,0 +1,45 @@
+"""add refresh_token table
+
+Revision ID: 5e9a3b7c1d42
+Revises: c2d7e5a1f304
+Create Date: 2026-10-18 15:40:26.771032
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3b7c1d42'
+down_revision: Union[str, Sequence[str], None] = 'c2d7e5a1f304'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_token',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index(op.f('ix_refresh_token_id'), 'refresh_token', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_refresh_token_token_hash'), 'refresh_token', ['token_hash'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_refresh_token_user_id'), 'refresh_token', ['user_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_token_user_id'), table_name='refresh_token', if_exists=True)
+    op.drop_index(op.f('ix_refresh_token_token_hash'), table_name='refresh_token', if_exists=True)
+    op.drop_index(op.f('ix_refresh_token_id'), table_name='refresh_token', if_exists=True)
+    op.drop_table('refresh_token', if_exists=True)
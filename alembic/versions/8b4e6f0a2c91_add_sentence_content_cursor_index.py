@@ -0,0 +1,39 @@
+"""add sentence_content cursor index
+
+Revision ID: 8b4e6f0a2c91
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 11:03:47.905126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6f0a2c91'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sentence_content_created_at_id',
+        'sentence_content',
+        ['created_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_sentence_content_created_at_id',
+        table_name='sentence_content',
+        if_exists=True,
+    )
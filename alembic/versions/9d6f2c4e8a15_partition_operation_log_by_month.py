@@ -0,0 +1,145 @@
+"""partition operation_log by month
+
+Revision ID: 9d6f2c4e8a15
+Revises: 5e9a3b7c1d42
+Create Date: 2026-10-18 17:12:54.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d6f2c4e8a15'
+down_revision: Union[str, Sequence[str], None] = '5e9a3b7c1d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    'id, user_id, user_type, action, resource_type, resource_id, '
+    'detail, ip_address, created_at'
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 将原有的普通表重建为按created_at按月分区的表：
+    # 覆盖已有数据的月份到未来两个月各建一个分区，并建立默认分区兜底
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            has_old_table boolean;
+            month_start date;
+            last_month date;
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_class
+                WHERE oid = to_regclass('operation_log') AND relkind = 'p'
+            ) THEN
+                RETURN;
+            END IF;
+
+            has_old_table := to_regclass('operation_log') IS NOT NULL;
+            IF has_old_table THEN
+                ALTER TABLE operation_log RENAME TO operation_log_unpartitioned;
+                ALTER INDEX IF EXISTS operation_log_pkey
+                    RENAME TO operation_log_unpartitioned_pkey;
+            END IF;
+
+            CREATE TABLE operation_log (
+                id UUID NOT NULL,
+                user_id UUID NOT NULL,
+                user_type VARCHAR(20) NOT NULL,
+                action VARCHAR(50) NOT NULL,
+                resource_type VARCHAR(50) NOT NULL,
+                resource_id UUID,
+                detail VARCHAR(2000),
+                ip_address VARCHAR(50),
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at);
+            CREATE TABLE operation_log_default PARTITION OF operation_log DEFAULT;
+
+            month_start := date_trunc('month', now())::date;
+            IF has_old_table THEN
+                EXECUTE 'SELECT coalesce(date_trunc(''month'', min(created_at))::date, $1) '
+                        'FROM operation_log_unpartitioned'
+                    INTO month_start USING month_start;
+            END IF;
+            last_month := (date_trunc('month', now()) + interval '2 month')::date;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF operation_log FOR VALUES FROM (%L) TO (%L)',
+                    'operation_log_p' || to_char(month_start, 'YYYYMM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+
+            IF has_old_table THEN
+                EXECUTE 'INSERT INTO operation_log (id, user_id, user_type, action, '
+                        'resource_type, resource_id, detail, ip_address, created_at) '
+                        'SELECT id, user_id, user_type, action, resource_type, '
+                        'resource_id, detail, ip_address, coalesce(created_at, now()) '
+                        'FROM operation_log_unpartitioned';
+                DROP TABLE operation_log_unpartitioned;
+            END IF;
+        END $$;
+        """
+    )
+    op.create_index(
+        'ix_operation_log_user_id_created_at',
+        'operation_log',
+        ['user_id', 'created_at'],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_operation_log_created_at_brin',
+        'operation_log',
+        ['created_at'],
+        unique=False,
+        postgresql_using='brin',
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_operation_log_created_at_brin', table_name='operation_log', if_exists=True
+    )
+    op.drop_index(
+        'ix_operation_log_user_id_created_at',
+        table_name='operation_log',
+        if_exists=True,
+    )
+    op.execute('ALTER TABLE operation_log RENAME TO operation_log_partitioned')
+    op.execute(
+        'ALTER INDEX IF EXISTS operation_log_pkey RENAME TO operation_log_partitioned_pkey'
+    )
+    op.create_table(
+        'operation_log',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('user_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('action', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('resource_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('resource_id', sa.Uuid(), nullable=True),
+        sa.Column('detail', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=True),
+        sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(
+        f'INSERT INTO operation_log ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM operation_log_partitioned'
+    )
+    op.execute('DROP TABLE operation_log_partitioned CASCADE')
+    op.create_index(op.f('ix_operation_log_id'), 'operation_log', ['id'], unique=True)
+    op.create_index(op.f('ix_operation_log_user_id'), 'operation_log', ['user_id'], unique=False)
@@ -0,0 +1,60 @@
+"""add score student_id exam_id unique constraint
+
+Revision ID: b4f8d1e6a273
+Revises: 9d6f2c4e8a15
+Create Date: 2026-10-18 19:05:31.742906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f8d1e6a273'
+down_revision: Union[str, Sequence[str], None] = '9d6f2c4e8a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 同一学生同一考试存在多条成绩时只保留最近更新的一条
+    op.execute(
+        """
+        DELETE FROM score
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY student_id, exam_id
+                    ORDER BY updated_at DESC NULLS LAST, id DESC
+                ) AS rn
+                FROM score
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'uq_score_student_id_exam_id'
+            ) THEN
+                ALTER TABLE score ADD CONSTRAINT uq_score_student_id_exam_id
+                    UNIQUE (student_id, exam_id);
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        'ALTER TABLE score DROP CONSTRAINT IF EXISTS uq_score_student_id_exam_id'
+    )
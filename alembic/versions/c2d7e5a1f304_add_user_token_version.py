@@ -0,0 +1,33 @@
+"""add user token_version
+
+Revision ID: c2d7e5a1f304
+Revises: 8b4e6f0a2c91
+Create Date: 2026-10-18 14:22:09.318457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d7e5a1f304'
+down_revision: Union[str, Sequence[str], None] = '8b4e6f0a2c91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'user',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user', 'token_version', if_exists=True)
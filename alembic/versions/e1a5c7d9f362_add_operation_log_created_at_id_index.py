@@ -0,0 +1,41 @@
+"""add operation_log created_at id index
+
+Revision ID: e1a5c7d9f362
+Revises: b4f8d1e6a273
+Create Date: 2026-10-19 10:14:26.508193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a5c7d9f362'
+down_revision: Union[str, Sequence[str], None] = 'b4f8d1e6a273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 分区表上创建索引会自动在每个分区（及之后新建的分区）上创建对应的本地索引，
+    # 按(created_at, id)倒序翻页时可以逐分区走索引并合并（Merge Append），无需全表排序
+    op.create_index(
+        'ix_operation_log_created_at_id',
+        'operation_log',
+        ['created_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_operation_log_created_at_id',
+        table_name='operation_log',
+        if_exists=True,
+    )
@@ -1,4 +1,4 @@
-from pydantic import computed_field, PostgresDsn
+from pydantic import computed_field, PositiveFloat, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import secrets
 import os
@@ -25,8 +25,36 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 刷新令牌有效期（天）
+    JWT_EMBED_CLAIMS: bool = False  # 是否在token中携带权限信息（鉴权时无需查询权限表）
+    JWT_CLAIMS_EXPIRE_MINUTES: int = 10  # 携带权限信息的token有效期（分钟），应较短
+    TOKEN_VERSION_CACHE_SECONDS: int = 10  # 用户token版本号缓存时间（秒），决定吊销生效的延迟
     FIRST_SUPERUSER: str = "admin@example.com"
     FIRST_SUPERUSER_PASSWORD: str
+    PASSWORD_HASH_WORKERS: int = 4  # 密码哈希/校验线程池大小
+    PASSWORD_HASH_MAX_PENDING: int = 64  # 密码哈希任务最大排队数，超出时返回503
+    DECODED_TOKEN_CACHE_SIZE: int = 4096  # 已验证token缓存容量，0表示不缓存
+    LOGIN_IP_BURST: int = 20  # 单个IP允许的连续登录尝试次数
+    LOGIN_IP_PER_MINUTE: PositiveFloat = 10  # 单个IP每分钟恢复的登录尝试次数，必须大于0
+    LOGIN_EMAIL_BURST: int = 5  # 单个邮箱允许的连续登录尝试次数
+    LOGIN_EMAIL_PER_MINUTE: PositiveFloat = 2  # 单个邮箱每分钟恢复的登录尝试次数，必须大于0
+    AUTH_CONTEXT_CACHE_SECONDS: int = 30  # 用户权限上下文缓存时间（秒），0表示不缓存
+
+    # Sentence
+    SENTENCE_POOL_REFRESH_SECONDS: int = 300  # 随机句子采样池和搜索索引后台全量重建间隔（秒）
+    LIKE_FLUSH_INTERVAL_SECONDS: float = 2.0  # 点赞缓冲批量落库间隔（秒）
+    LIKE_DEDUP_DB_FALLBACK: bool = False  # 点赞去重索引未命中时是否回退查询数据库（多进程部署时开启）
+    SENTENCE_STATS_CACHE_SECONDS: int = 10  # 句子统计结果缓存时间（秒），0表示不缓存
+    SENTENCE_COUNT_CACHE_SECONDS: int = 30  # 游标分页总条数缓存时间（秒），0表示不缓存
+    CATEGORY_CACHE_SECONDS: int = 300  # 分类列表缓存时间（秒），分类增删改时立即失效
+    SENTENCE_SEARCH_ID_LIMIT: int = 1000  # 搜索命中超过该数量时在内存中计数和分页，不再把ID列表传给数据库
+
+    # School
+    OPERATION_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0  # 操作日志批量落库间隔（秒）
+    OPERATION_LOG_QUEUE_SIZE: int = 10000  # 操作日志内存队列上限，写满时同步落库
+    OPERATION_LOG_PARTITION_MONTHS_AHEAD: int = 2  # 操作日志提前创建的月分区数量
+    OPERATION_LOG_RETENTION_MONTHS: int = 0  # 操作日志保留月数，0表示永久保留
+    OPERATION_LOG_ARCHIVE_EXPIRED: bool = True  # 过期分区分离为归档表，默认分区中的过期日志移入operation_log_archive_default（false时直接删除）
 
     @computed_field
     @property
@@ -0,0 +1,14 @@
+import asyncio
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+
+# 周期性地在线程池中执行同步任务（用于后台批量刷写等场景）
+async def run_periodically(func: Callable[[], object], interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(func)
+        except Exception as e:
+            print(f"后台任务执行失败：{str(e)}")
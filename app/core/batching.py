@@ -0,0 +1,22 @@
+from itertools import islice
+from typing import Iterable, Iterator, Sequence
+
+# 单条语句允许绑定的参数数量上限（Postgres协议限制为65535，留出余量）
+MAX_BIND_PARAMS = 60000
+
+# 流式导入文件时每批解析、校验并写入的行数
+IMPORT_BATCH_SIZE = 1000
+
+
+# 将可迭代对象按固定大小切分为列表，适用于流式读取的数据
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+# 将多行插入/更新的数据按参数数量上限切分，每块可以放进一条语句
+def statement_chunks(rows: Sequence) -> Iterator[list]:
+    if not rows:
+        return iter(())
+    return chunked(rows, max(MAX_BIND_PARAMS // len(rows[0]), 1))
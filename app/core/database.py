@@ -1,8 +1,12 @@
+import os
+import time
+
+from sqlalchemy import ARRAY, any_, bindparam, exists, inspect, or_
 from sqlmodel import create_engine, Session, select, SQLModel
 
 from app.user.model import UserModel, UserCreateAndUpdate
 from app.user.server import create_user
-from app.config import fastapi_config
+from app.config import fastapi_config, PROJECT_ROOT
 from fastapi import Depends
 from typing import Annotated
 
@@ -27,15 +31,78 @@ def _get_session():
 SessionDep = Annotated[Session, Depends(_get_session)]
 
 
+# 构造 column = ANY(:values) 条件，整个列表只占用一个数组参数，不受参数数量上限限制
+def any_of(column, values):
+    return column == any_(
+        bindparam(None, value=list(values), type_=ARRAY(column.type))
+    )
+
+
+# Alembic迁移脚本目录，项目中没有alembic.ini时返回None
+def _alembic_script():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    alembic_ini = os.path.join(PROJECT_ROOT, "alembic.ini")
+    if not os.path.exists(alembic_ini):
+        return None
+    return ScriptDirectory.from_config(Config(alembic_ini))
+
+
+# 判断数据库结构是否已由Alembic迁移到最新版本
+def _schema_is_current() -> bool:
+    from alembic.runtime.migration import MigrationContext
+
+    script = _alembic_script()
+    if script is None:
+        return False
+    with engine.connect() as connection:
+        current_heads = MigrationContext.configure(connection).get_current_heads()
+    return bool(current_heads) and set(current_heads) == set(script.get_heads())
+
+
+# 使用 create_all 建表；空数据库建表后即为最新结构，同时标记为最新迁移版本，
+# 之后启动时 _schema_is_current 成立即可跳过 create_all
+def _create_schema():
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        is_empty = not inspect(connection).get_table_names()
+    SQLModel.metadata.create_all(engine)  # 开发环境可以使用该行代码初始化数据库
+    # 已有表但没有迁移版本的数据库结构可能是旧的，需要手动执行 alembic upgrade
+    script = _alembic_script()
+    if not is_empty or script is None:
+        return
+    with engine.begin() as connection:
+        MigrationContext.configure(connection).stamp(script, "head")
+
+
 def init_db():
     try:
-        with Session(engine) as session:
-            SQLModel.metadata.create_all(engine)  # 开发环境可以使用该行代码初始化数据库
+        timings = {}
+        started_at = time.perf_counter()
+        # 数据库已迁移到最新版本时跳过逐表检查的 create_all
+        try:
+            schema_is_current = _schema_is_current()
+        except Exception as e:
+            print(f"检查数据库迁移版本失败：{str(e)}")
+            schema_is_current = False
+        if not schema_is_current:
+            _create_schema()
+        timings["表结构检查"] = time.perf_counter() - started_at
 
-            statement = select(UserModel)
-            users = session.exec(statement).all()
-            user_count = len(users)
-            if user_count == 0:
+        started_at = time.perf_counter()
+        with Session(engine) as session:
+            # 只检查是否已存在超级管理员（或初始超级管理员邮箱已注册），不读取用户表
+            statement = select(
+                exists().where(
+                    or_(
+                        UserModel.is_superuser == True,  # noqa: E712
+                        UserModel.email == fastapi_config.FIRST_SUPERUSER,
+                    )
+                )
+            )
+            if not session.exec(statement).one():
                 user_db = UserCreateAndUpdate(
                     email=fastapi_config.FIRST_SUPERUSER,
                     hashed_password=fastapi_config.FIRST_SUPERUSER_PASSWORD,
@@ -46,7 +113,12 @@ def init_db():
                 user_sup.active = True
                 session.add(user_sup)
                 session.commit()
-            print("🚀 数据库初始化完成")
+        timings["超级管理员检查"] = time.perf_counter() - started_at
+
+        breakdown = "，".join(
+            f"{name} {seconds * 1000:.1f}ms" for name, seconds in timings.items()
+        )
+        print(f"🚀 数据库初始化完成（{breakdown}）")
     except Exception as e:
         print(f"数据库初始化失败：{e}")
 
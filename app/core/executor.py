@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from fastapi import HTTPException, status
+
+
+# 有界线程池：限制同时排队的任务数，超出上限时直接拒绝（503），
+# 用于密码哈希等CPU密集任务，避免突发请求拖垮事件循环和线程池
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        # 正在执行和排队中的任务数
+        self._in_flight = 0
+        self.submitted = 0
+        self.rejected = 0
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self._max_workers + self._max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="服务繁忙，请稍后重试",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+            self.submitted += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    # 在线程池中执行任务并等待结果（供同步代码调用）
+    def run(self, func: Callable, *args):
+        self._acquire()
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._release()
+
+    # 在线程池中执行任务并等待结果（供异步代码调用，不阻塞事件循环）
+    async def run_async(self, func: Callable, *args):
+        self._acquire()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(func, *args))
+        finally:
+            self._release()
+
+    # 线程池统计信息
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self._max_workers,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - self._max_workers, 0),
+                "max_pending": self._max_pending,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
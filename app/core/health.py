@@ -2,6 +2,8 @@ from datetime import datetime
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from app.core.metrics import collect_metrics
+
 # 记录应用启动时间
 app_start_time = datetime.now()
 
@@ -36,4 +38,13 @@ async def health_check():
         "status": "healthy",
         "uptime": uptime_dict,
         "timestamp": current_time.isoformat()
-    }
\ No newline at end of file
+    }
+
+# 运行时指标端点
+@health_router.get("/metrics")
+async def metrics():
+    """运行时指标端点，返回线程池队列深度等内部统计"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "metrics": collect_metrics(),
+    }
@@ -0,0 +1,20 @@
+from typing import Callable
+
+# 指标提供者：名称 -> 返回指标字典的函数，各模块在导入时注册
+_providers: dict[str, Callable[[], dict]] = {}
+
+
+# 注册运行时指标
+def register_metrics(name: str, provider: Callable[[], dict]):
+    _providers[name] = provider
+
+
+# 汇总所有已注册的运行时指标
+def collect_metrics() -> dict:
+    metrics = {}
+    for name, provider in _providers.items():
+        try:
+            metrics[name] = provider()
+        except Exception as e:
+            print(f"获取运行时指标失败：{str(e)}")
+    return metrics
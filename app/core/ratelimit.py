@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+# 令牌桶限流器：每个键一个桶，按固定速率补充令牌，令牌不足时拒绝。
+# 桶状态只保存(剩余令牌, 上次更新时间)，超出容量时淘汰最久未使用的桶，
+# 闲置到令牌补满的桶与新桶等价，可随时淘汰
+class TokenBucketLimiter:
+    def __init__(self, capacity: float, refill_per_second: float, maxsize: int):
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._rate = refill_per_second
+        self._maxsize = maxsize
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+
+    # 尝试消耗一个令牌，返回(是否允许, 需要等待的秒数)
+    def acquire(self, key: Hashable) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self._capacity, now))
+            tokens = min(self._capacity, tokens + (now - updated_at) * self._rate)
+            if tokens >= 1:
+                allowed, retry_after = True, 0.0
+                tokens -= 1
+                self.allowed += 1
+            else:
+                allowed, retry_after = False, (1 - tokens) / self._rate
+                self.rejected += 1
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+            return allowed, retry_after
+
+    # 淘汰已补满的闲置桶，仍超出容量时淘汰最久未使用的桶
+    def _evict(self, now: float):
+        full_after = self._capacity / self._rate
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < full_after and len(self._buckets) <= self._maxsize:
+                break
+            del self._buckets[key]
+
+    # 限流统计信息
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": len(self._buckets),
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+            }
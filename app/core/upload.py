@@ -0,0 +1,40 @@
+import csv
+import io
+import os
+from contextlib import contextmanager
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile, status
+
+
+# 确定上传文件的格式：优先使用显式指定的格式，否则根据文件扩展名判断，不支持时返回400
+# formats为扩展名到格式的映射，例如 {".csv": "csv", ".jsonl": "ndjson"}
+def resolve_upload_format(
+    file: UploadFile, file_format: str | None, formats: dict[str, str]
+) -> str:
+    if file_format is None:
+        extension = os.path.splitext(file.filename or "")[1].lower()
+        file_format = formats.get(extension)
+    supported = list(dict.fromkeys(formats.values()))
+    if file_format not in supported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的文件格式，仅支持{'和'.join(supported)}",
+        )
+    return file_format
+
+
+# 以UTF-8（兼容BOM）逐行读取上传的文本文件
+def open_text(file: BinaryIO) -> io.TextIOWrapper:
+    return io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+
+# 将解析上传文件时的编码和CSV格式错误转换为400
+@contextmanager
+def upload_errors():
+    try:
+        yield
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="文件编码错误，请使用UTF-8编码")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"CSV格式错误：{str(e)}")
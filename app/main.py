@@ -1,9 +1,18 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.user.route import auth_router
 from app.core.database import init_db, close_db
+from app.core.background import run_periodically
+from app.config import fastapi_config
 from app.sentence.route import sentence_route
+from app.sentence.like import like_buffer, like_dedup_index
+from app.sentence.cache import sentence_sampler
+from app.sentence.search import sentence_search_index
+from app.user.server import password_hash_executor
+from app.school.audit import audit_log_writer
+from app.school.partition import maintain_operation_log
 from app.core.health import health_router
 from app.school.route import (
     school_router,
@@ -20,7 +29,52 @@ from app.school.route import (
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     init_db()
+    # 预建操作日志分区并清理过期日志，之后每天执行一次
+    try:
+        maintain_operation_log()
+    except Exception as e:
+        print(f"操作日志分区维护失败：{str(e)}")
+    # 加载今天的点赞记录到去重索引，失败时点赞去重回退到数据库查询
+    try:
+        like_dedup_index.seed()
+    except Exception as e:
+        print(f"点赞去重索引加载失败：{str(e)}")
+    like_flush_task = asyncio.create_task(
+        run_periodically(like_buffer.flush, fastapi_config.LIKE_FLUSH_INTERVAL_SECONDS)
+    )
+    audit_flush_task = asyncio.create_task(
+        run_periodically(
+            audit_log_writer.flush,
+            fastapi_config.OPERATION_LOG_FLUSH_INTERVAL_SECONDS,
+        )
+    )
+    log_maintenance_task = asyncio.create_task(
+        run_periodically(maintain_operation_log, 24 * 60 * 60)
+    )
+    # 采样池和搜索索引在后台定期全量重建，请求路径只在首次使用时加载
+    cache_refresh_tasks = [
+        asyncio.create_task(
+            run_periodically(cache.refresh, fastapi_config.SENTENCE_POOL_REFRESH_SECONDS)
+        )
+        for cache in (sentence_sampler, sentence_search_index)
+    ]
     yield
+    like_flush_task.cancel()
+    audit_flush_task.cancel()
+    log_maintenance_task.cancel()
+    for task in cache_refresh_tasks:
+        task.cancel()
+    # 关闭前将缓冲中的点赞全部落库
+    try:
+        like_buffer.flush()
+    except Exception as e:
+        print(f"点赞缓冲落库失败：{str(e)}")
+    # 关闭前将队列中的操作日志全部落库
+    try:
+        audit_log_writer.flush()
+    except Exception as e:
+        print(f"操作日志落库失败：{str(e)}")
+    password_hash_executor.shutdown()
     close_db()
 
 
@@ -39,6 +93,7 @@ app.add_middleware(
     allow_credentials=True,  # 允许携带Cookie等凭证
     allow_methods=["*"],  # 允许所有HTTP方法（GET、POST、PUT、DELETE等）
     allow_headers=["*"],  # 允许所有请求头
+    expose_headers=["X-Next-Cursor"],  # 允许前端读取分页游标响应头
 )
 app.include_router(sentence_route, prefix="/sentence", tags=["Sentence"])
 app.include_router(auth_router, prefix="/user", tags=["Auth"])
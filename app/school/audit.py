@@ -0,0 +1,89 @@
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+
+from sqlmodel import Session, insert
+
+from app.config import fastapi_config
+from app.core.batching import statement_chunks
+from app.core.database import engine
+from app.core.metrics import register_metrics
+from app.school.model import OperationLogModel
+
+
+# 操作日志异步写入器：业务请求只把日志放入内存队列，由后台任务定期批量写入数据库。
+# 队列有上限，写满时由调用方线程同步落库（背压），数据库不可用时丢弃最旧的日志
+class AuditLogWriter:
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._max_size = max_size
+        self._rows: deque[dict] = deque()
+        self.enqueued = 0
+        self.written = 0
+        self.backpressure = 0
+        self.dropped = 0
+
+    # 加入一条日志（记录时间在入队时确定）
+    def add(self, **fields):
+        row = {"id": uuid.uuid7(), "created_at": datetime.now(), **fields}
+        with self._lock:
+            if len(self._rows) < self._max_size:
+                self._rows.append(row)
+                self.enqueued += 1
+                return
+            self.backpressure += 1
+        # 队列已满：在调用方线程中同步落库，限制内存占用
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"操作日志落库失败：{str(e)}")
+        with self._lock:
+            self._rows.append(row)
+            self.enqueued += 1
+            self._trim()
+
+    # 超出上限时丢弃最旧的日志（仅在数据库持续不可用时发生）
+    def _trim(self):
+        while len(self._rows) > self._max_size:
+            self._rows.popleft()
+            self.dropped += 1
+
+    # 将队列中的日志批量写入数据库
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._rows)
+                self._rows.clear()
+            if not rows:
+                return
+            try:
+                with Session(engine) as session:
+                    for chunk in statement_chunks(rows):
+                        session.exec(insert(OperationLogModel).values(chunk))
+                    session.commit()
+            except Exception:
+                # 写入失败时放回队列头部，等待下次重试
+                with self._lock:
+                    self._rows.extendleft(reversed(rows))
+                    self._trim()
+                raise
+            with self._lock:
+                self.written += len(rows)
+
+    # 写入器统计信息
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._rows),
+                "max_size": self._max_size,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "backpressure": self.backpressure,
+                "dropped": self.dropped,
+            }
+
+
+audit_log_writer = AuditLogWriter(fastapi_config.OPERATION_LOG_QUEUE_SIZE)
+register_metrics("audit_log_writer", audit_log_writer.stats)
@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import uuid
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.school.model import ClassModel, ExamModel, ScoreModel, StudentModel
+from app.school.server import SUBJECT_FIELDS, check_school_access, get_user_permission
+
+# 导出格式 -> (Content-Type, 文件扩展名)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# 服务端游标每次从数据库取回的行数，同时也是写出一个数据块的行数
+EXPORT_BATCH_SIZE = 1000
+
+# 导出的全部列（字段名, 中文名）
+EXPORT_COLUMNS = [
+    ("student_number", "学号"),
+    ("student_name", "姓名"),
+    ("class_name", "班级"),
+    ("exam_name", "考试"),
+    ("exam_date", "考试日期"),
+    *SUBJECT_FIELDS,
+]
+
+
+# 构造成绩导出查询：学生姓名、学号、班级和考试信息在SQL中关联
+def build_score_export_statement(
+    exam_id: uuid.UUID | None = None,
+    class_id: uuid.UUID | None = None,
+    school_id: uuid.UUID | None = None,
+    school_ids: set[uuid.UUID] | None = None,
+):
+    statement = (
+        select(
+            StudentModel.student_number,
+            StudentModel.name.label("student_name"),
+            ClassModel.name.label("class_name"),
+            ExamModel.name.label("exam_name"),
+            ExamModel.exam_date,
+            *(getattr(ScoreModel, field) for field, _ in SUBJECT_FIELDS),
+        )
+        .join(StudentModel, ScoreModel.student_id == StudentModel.id)
+        .join(ClassModel, StudentModel.class_id == ClassModel.id)
+        .join(ExamModel, ScoreModel.exam_id == ExamModel.id)
+    )
+    if exam_id:
+        statement = statement.where(ScoreModel.exam_id == exam_id)
+    if class_id:
+        statement = statement.where(StudentModel.class_id == class_id)
+    if school_id:
+        statement = statement.where(ClassModel.school_id == school_id)
+    # 非超级管理员只能导出所管理学校的数据
+    if school_ids is not None:
+        statement = statement.where(ClassModel.school_id.in_(school_ids))
+    return statement.order_by(
+        ExamModel.exam_date, ClassModel.name, StudentModel.student_number
+    )
+
+
+# 使用服务端游标逐批读取导出数据，内存占用与导出总行数无关
+def _iter_batches(statement) -> Iterator[list]:
+    # 响应开始流式输出时请求的会话可能已经关闭，这里使用独立的会话
+    with Session(engine) as session:
+        result = session.exec(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield partition
+
+
+def _iter_csv(statement) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # 带BOM便于Excel正确识别UTF-8编码
+    buffer.write("\ufeff")
+    writer.writerow(name for _, name in EXPORT_COLUMNS)
+    for rows in _iter_batches(statement):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _iter_ndjson(statement) -> Iterator[bytes]:
+    fields = [field for field, _ in EXPORT_COLUMNS]
+    for rows in _iter_batches(statement):
+        lines = (
+            json.dumps(dict(zip(fields, row)), ensure_ascii=False, default=str)
+            for row in rows
+        )
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# 只追加的写出目标：ParquetWriter写入的数据按块取走，避免在内存中保留整个文件
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._size
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _iter_parquet(statement) -> Iterator[bytes]:
+    fields = [field for field, _ in EXPORT_COLUMNS]
+    schema = pa.schema(
+        [
+            ("student_number", pa.string()),
+            ("student_name", pa.string()),
+            ("class_name", pa.string()),
+            ("exam_name", pa.string()),
+            ("exam_date", pa.date32()),
+            *((field, pa.float64()) for field, _ in SUBJECT_FIELDS),
+        ]
+    )
+    sink = _ChunkSink()
+    # 每批数据写成一个行组并立即输出
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in _iter_batches(statement):
+            columns = list(zip(*rows))
+            writer.write_table(
+                pa.table(dict(zip(fields, columns)), schema=schema)
+            )
+            yield sink.take()
+    yield sink.take()
+
+
+# 导出成绩方法：在请求会话中完成权限校验，返回流式生成的文件内容
+def export_scores(
+    session: Session,
+    token: str,
+    file_format: str,
+    exam_id: uuid.UUID | None = None,
+    class_id: uuid.UUID | None = None,
+    school_id: uuid.UUID | None = None,
+) -> Iterator[bytes]:
+    if not (exam_id or class_id or school_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请至少指定考试、班级或学校中的一个导出范围",
+        )
+    if exam_id:
+        exam_db = session.get(ExamModel, exam_id)
+        if not exam_db:
+            raise HTTPException(status_code=404, detail="考试不存在")
+        check_school_access(session, token, exam_db.school_id)
+    if class_id:
+        class_db = session.get(ClassModel, class_id)
+        if not class_db:
+            raise HTTPException(status_code=404, detail="班级不存在")
+        check_school_access(session, token, class_db.school_id)
+    if school_id:
+        check_school_access(session, token, school_id)
+    perm = get_user_permission(session, token)
+    statement = build_score_export_statement(
+        exam_id,
+        class_id,
+        school_id,
+        None if perm.is_superuser else set(perm.school_ids),
+    )
+    if file_format == "csv":
+        return _iter_csv(statement)
+    if file_format == "ndjson":
+        return _iter_ndjson(statement)
+    return _iter_parquet(statement)
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING, Optional
 from datetime import datetime, date
 from enum import Enum
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index, UniqueConstraint
 from sqlmodel import SQLModel, Field, func, Relationship
 import uuid
 from pydantic import field_validator, EmailStr
@@ -64,19 +64,34 @@ class SchoolAdminModel(SQLModel, table=True):
     school: SchoolModel = Relationship(back_populates="school_admins")
 
 
+# 操作日志按created_at按月分区（分区由 app/school/partition.py 维护），
+# 分区表的主键必须包含分区键，因此主键为(id, created_at)
 class OperationLogModel(SQLModel, table=True):
     __tablename__ = "operation_log"
-    id: uuid.UUID = Field(
-        default_factory=uuid.uuid7, primary_key=True, index=True, unique=True
+    __table_args__ = (
+        # 按用户查询日志并按时间倒序翻页使用的复合索引
+        Index("ix_operation_log_user_id_created_at", "user_id", "created_at"),
+        # 不按用户筛选时按(created_at, id)倒序翻页使用的复合索引，分区表上为各分区的本地索引
+        Index("ix_operation_log_created_at_id", "created_at", "id"),
+        # 日志按时间顺序写入，BRIN索引体积极小且适合按时间范围扫描
+        Index(
+            "ix_operation_log_created_at_brin",
+            "created_at",
+            postgresql_using="brin",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
-    user_id: uuid.UUID = Field(description="操作用户ID", index=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid7, primary_key=True)
+    user_id: uuid.UUID = Field(description="操作用户ID")
     user_type: str = Field(description="用户类型", max_length=20)
     action: str = Field(description="操作类型", max_length=50)
     resource_type: str = Field(description="资源类型", max_length=50)
     resource_id: uuid.UUID | None = Field(description="资源ID", default=None)
     detail: str | None = Field(description="操作详情", default=None, max_length=2000)
     ip_address: str | None = Field(description="操作IP地址", default=None, max_length=50)
-    created_at: datetime = Field(sa_column=Column(DateTime, default=func.now()))
+    created_at: datetime = Field(
+        sa_column=Column(DateTime, primary_key=True, default=func.now())
+    )
 
 
 class ClassModel(SQLModel, table=True):
@@ -145,6 +160,10 @@ class ExamModel(SQLModel, table=True):
 
 class ScoreModel(SQLModel, table=True):
     __tablename__ = "score"
+    __table_args__ = (
+        # 每个学生在每场考试中只有一条成绩，同时作为upsert的冲突目标
+        UniqueConstraint("student_id", "exam_id", name="uq_score_student_id_exam_id"),
+    )
     id: uuid.UUID = Field(
         default_factory=uuid.uuid7, primary_key=True, index=True, unique=True
     )
@@ -230,6 +249,7 @@ class BatchImportResult(SQLModel):
     success_count: int = Field(description="成功导入数量")
     fail_count: int = Field(description="失败数量")
     duplicates: list[str] = Field(default=[], description="重复记录列表")
+    updated_count: int = Field(default=0, description="覆盖更新数量（包含在成功数量中）")
     errors: list[str] = Field(description="错误信息列表")
 
 
@@ -288,7 +308,7 @@ class StudentBatchItem(SQLModel):
 
 class StudentBatchCreate(SQLModel):
     class_id: uuid.UUID = Field(description="所属班级ID")
-    students: list[StudentBatchItem] = Field(description="学生列表", min_length=1, max_length=100)
+    students: list[StudentBatchItem] = Field(description="学生列表", min_length=1, max_length=50000)
 
 
 class ExamCreate(SQLModel):
@@ -655,8 +675,10 @@ class PaginatedScoreResponse(SQLModel):
 
 
 class PaginatedLogResponse(SQLModel):
-    total: int = Field(description="总记录数")
-    page: int = Field(description="当前页码")
+    total: int | None = Field(description="总记录数（游标分页时为空）")
+    page: int | None = Field(description="当前页码（游标分页时为空）")
     page_size: int = Field(description="每页记录数")
-    total_pages: int = Field(description="总页数")
+    total_pages: int | None = Field(description="总页数（游标分页时为空）")
+    has_more: bool | None = Field(description="是否还有下一页", default=None)
+    next_cursor: str | None = Field(description="下一页游标", default=None)
     items: list[OperationLogResponse] = Field(description="日志列表")
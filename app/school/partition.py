@@ -0,0 +1,135 @@
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from app.config import fastapi_config
+from app.core.database import engine
+
+# 按月分区的命名规则：operation_log_pYYYYMM
+PARTITION_PATTERN = re.compile(r"^operation_log_p(\d{4})(\d{2})$")
+
+
+# 当月第一天
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+# 月份加减
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+# 判断operation_log是否为分区表（尚未执行分区迁移时跳过分区维护）
+def _is_partitioned(connection) -> bool:
+    statement = text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('operation_log')"
+    )
+    return connection.execute(statement).scalar() is True
+
+
+# 确保默认分区以及当月和之后若干个月的分区存在
+def ensure_operation_log_partitions():
+    with engine.connect() as connection:
+        if not _is_partitioned(connection):
+            return
+    statements = [
+        "CREATE TABLE IF NOT EXISTS operation_log_default "
+        "PARTITION OF operation_log DEFAULT"
+    ]
+    current_month = _month_start(date.today())
+    for offset in range(fastapi_config.OPERATION_LOG_PARTITION_MONTHS_AHEAD + 1):
+        start = _add_months(current_month, offset)
+        end = _add_months(start, 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS operation_log_p{start:%Y%m} "
+            f"PARTITION OF operation_log FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    # 每个分区单独提交，某个分区创建失败不影响其他分区
+    for statement in statements:
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(statement))
+        except Exception as e:
+            print(f"创建操作日志分区失败：{str(e)}")
+
+
+# 清理超过保留期限的操作日志：整月分区直接分离（归档）或删除，代价与数据量无关
+def apply_operation_log_retention():
+    retention_months = fastapi_config.OPERATION_LOG_RETENTION_MONTHS
+    if retention_months <= 0:
+        return
+    cutoff = _add_months(_month_start(date.today()), -retention_months)
+    with engine.connect() as connection:
+        if not _is_partitioned(connection):
+            return
+        partitions = connection.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'operation_log'::regclass"
+            )
+        ).scalars().all()
+    archive = fastapi_config.OPERATION_LOG_ARCHIVE_EXPIRED
+    for name in partitions:
+        match = PARTITION_PATTERN.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(month, 1) > cutoff:
+            continue
+        # 每个分区单独处理，某个分区失败不影响其他分区
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text(f"ALTER TABLE operation_log DETACH PARTITION {name}")
+                )
+                if archive:
+                    _archive_partition(connection, name, f"operation_log_archive_{month:%Y%m}")
+                else:
+                    connection.execute(text(f"DROP TABLE {name}"))
+            print(f"操作日志分区{name}已过期，已{'归档' if archive else '删除'}")
+        except Exception as e:
+            print(f"清理操作日志分区{name}失败：{str(e)}")
+    # 落入默认分区的过期日志逐行删除，归档模式下先写入默认分区的归档表
+    with engine.begin() as connection:
+        if archive:
+            connection.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS operation_log_archive_default "
+                    "(LIKE operation_log)"
+                )
+            )
+            connection.execute(
+                text(
+                    "WITH expired AS ("
+                    "DELETE FROM operation_log_default WHERE created_at < :cutoff "
+                    "RETURNING *) "
+                    "INSERT INTO operation_log_archive_default SELECT * FROM expired"
+                ),
+                {"cutoff": cutoff},
+            )
+        else:
+            connection.execute(
+                text("DELETE FROM operation_log_default WHERE created_at < :cutoff"),
+                {"cutoff": cutoff},
+            )
+
+
+# 将分离后的分区保留为独立的归档表；同名归档表已存在时把数据并入后删除分区
+def _archive_partition(connection, name: str, archive_name: str):
+    exists = connection.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": archive_name}
+    ).scalar()
+    if not exists:
+        connection.execute(text(f"ALTER TABLE {name} RENAME TO {archive_name}"))
+        return
+    connection.execute(text(f"INSERT INTO {archive_name} SELECT * FROM {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
+
+
+# 操作日志分区维护任务：预建分区并清理过期日志（启动时和每天执行）
+def maintain_operation_log():
+    ensure_operation_log_partitions()
+    apply_operation_log_retention()
@@ -1,7 +1,19 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, status, Query, Depends, Request, Path
+from fastapi import (
+    APIRouter,
+    status,
+    Query,
+    Depends,
+    Request,
+    Path,
+    Response,
+    HTTPException,
+    UploadFile,
+    Form,
+)
+from fastapi.responses import StreamingResponse
 
 from app.school.model import (
     SchoolCreate,
@@ -45,8 +57,10 @@ from app.school.model import (
     PaginatedLogResponse,
 )
 from app.core.database import SessionDep
+from app.core.upload import resolve_upload_format
 from app.user.route import oauth2_scheme
 import app.school.server as server
+from app.school import export
 
 school_router = APIRouter()
 class_router = APIRouter()
@@ -599,7 +613,7 @@ def get_exam_scores_route(
 
 @score_router.post(
     "/",
-    summary="创建单个成绩",
+    summary="创建单个成绩（支持覆盖更新）",
     response_model=ScoreResponse,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -612,16 +626,17 @@ def get_exam_scores_route(
 def create_score_route(
     session: SessionDep,
     score: ScoreCreate,
+    upsert: bool = Query(False, description="已有成绩时覆盖更新，而不是返回409"),
     token: str = Depends(oauth2_scheme),
     request: Request = None,
 ):
     ip_address = request.client.host if request else None
-    return server.create_score(session, score, token, ip_address)
+    return server.create_score(session, score, token, ip_address, upsert)
 
 
 @score_router.post(
     "/batch",
-    summary="批量创建成绩",
+    summary="批量创建成绩（支持覆盖更新）",
     response_model=BatchImportResult,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -632,11 +647,47 @@ def create_score_route(
 def create_scores_batch_route(
     session: SessionDep,
     scores: list[ScoreCreate],
+    upsert: bool = Query(False, description="已有成绩时按提交的科目覆盖更新，而不是记为重复"),
+    token: str = Depends(oauth2_scheme),
+    request: Request = None,
+):
+    ip_address = request.client.host if request else None
+    return server.create_scores_batch(session, scores, token, ip_address, upsert)
+
+
+# 根据文件扩展名推断成绩表格式
+SCORE_IMPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+
+@score_router.post(
+    "/import",
+    summary="流式导入考试成绩（CSV/XLSX）",
+    description="表头需包含学号列（student_number或学号），科目列可使用字段名或中文科目名，其他列忽略",
+    response_model=BatchImportResult,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "文件格式错误"},
+        401: {"model": ErrorResponse, "description": "未授权"},
+        403: {"model": ErrorResponse, "description": "权限不足"},
+        404: {"model": ErrorResponse, "description": "考试不存在"},
+    },
+)
+def import_scores_route(
+    session: SessionDep,
+    file: UploadFile,
+    exam_id: uuid.UUID = Form(..., description="成绩所属考试ID"),
+    file_format: str = Query(
+        None, description="文件格式（csv或xlsx），不传入时根据文件扩展名判断"
+    ),
+    upsert: bool = Query(False, description="已有成绩时按表中的科目覆盖更新，而不是记为重复"),
     token: str = Depends(oauth2_scheme),
     request: Request = None,
 ):
+    file_format = resolve_upload_format(file, file_format, SCORE_IMPORT_FORMATS)
     ip_address = request.client.host if request else None
-    return server.create_scores_batch(session, scores, token, ip_address)
+    return server.import_scores(
+        session, file.file, file_format, exam_id, token, ip_address, upsert
+    )
 
 
 @score_router.get(
@@ -659,6 +710,42 @@ def get_scores_route(
     return server.get_scores(session, token, page, page_size, exam_id, student_id)
 
 
+@score_router.get(
+    "/export",
+    summary="流式导出成绩（CSV/NDJSON/Parquet）",
+    description="按考试、班级或学校导出成绩，至少指定一个范围，多个范围同时指定时取交集",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "参数错误"},
+        401: {"model": ErrorResponse, "description": "未授权"},
+        403: {"model": ErrorResponse, "description": "权限不足"},
+        404: {"model": ErrorResponse, "description": "考试或班级不存在"},
+    },
+)
+def export_scores_route(
+    session: SessionDep,
+    exam_id: uuid.UUID | None = Query(None, description="按考试导出"),
+    class_id: uuid.UUID | None = Query(None, description="按班级导出"),
+    school_id: uuid.UUID | None = Query(None, description="按学校导出"),
+    file_format: str = Query("csv", description="导出格式（csv、ndjson或parquet）"),
+    token: str = Depends(oauth2_scheme),
+):
+    if file_format not in export.EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="不支持的导出格式，仅支持csv、ndjson和parquet",
+        )
+    content = export.export_scores(
+        session, token, file_format, exam_id, class_id, school_id
+    )
+    media_type, extension = export.EXPORT_FORMATS[file_format]
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="scores.{extension}"'},
+    )
+
+
 @score_router.get(
     "/{score_id}",
     summary="获取单个成绩",
@@ -1097,9 +1184,23 @@ def get_operation_logs_route(
     user_id: uuid.UUID | None = Query(None, description="按用户ID筛选"),
     action: str | None = Query(None, description="按操作类型筛选"),
     resource_type: str | None = Query(None, description="按资源类型筛选"),
+    use_cursor: bool = Query(
+        False, description="是否使用游标分页（不返回总数，深翻页耗时恒定）"
+    ),
+    cursor: str | None = Query(
+        None, description="游标分页的位置，取上一页返回的next_cursor，传入时自动启用游标分页"
+    ),
 ):
     return server.get_operation_logs(
-        session, token, page, page_size, user_id, action, resource_type
+        session,
+        token,
+        page,
+        page_size,
+        user_id,
+        action,
+        resource_type,
+        use_cursor,
+        cursor,
     )
 
 
@@ -1115,7 +1216,16 @@ def get_operation_logs_route(
 )
 def get_user_logs_route(
     session: SessionDep,
+    response: Response,
     user_id: uuid.UUID = Path(description="用户ID"),
     token: str = Depends(oauth2_scheme),
+    limit: Annotated[int, Query(ge=1, le=1000, description="返回的最大记录数")] = 100,
+    cursor: str | None = Query(
+        None, description="分页游标，取上一次响应头X-Next-Cursor的值"
+    ),
 ):
-    return server.get_user_logs(session, user_id, token)
+    logs, next_cursor = server.get_user_logs(session, user_id, token, limit, cursor)
+    # 还有更早的日志时通过响应头返回下一页游标，响应体保持为日志列表
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
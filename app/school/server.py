@@ -1,9 +1,14 @@
+import csv
 import uuid
 import json
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, BinaryIO
 from fastapi import HTTPException, status
-from sqlmodel import Session, select, func, col
-from sqlalchemy import case
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlmodel import Session, select, func, col, tuple_
+from sqlalchemy import case, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.school.model import (
     SchoolModel,
@@ -53,10 +58,17 @@ from app.school.model import (
     ExamPassRateStats,
 )
 from app.user.model import UserModel, UserCreateAndUpdate
-from app.user.server import get_current_user, get_password_hash
-from pwdlib import PasswordHash
-
-password_hash = PasswordHash.recommended()
+from app.school.audit import audit_log_writer
+from app.core.batching import IMPORT_BATCH_SIZE, chunked, statement_chunks
+from app.core.database import any_of
+from app.core.upload import open_text, upload_errors
+from app.core.pagination import encode_cursor, decode_cursor
+from app.user.server import (
+    get_auth_context,
+    get_password_hash,
+    revoke_user_tokens,
+    invalidate_auth_caches,
+)
 
 
 def log_operation(
@@ -69,7 +81,8 @@ def log_operation(
     detail: str | None = None,
     ip_address: str | None = None,
 ):
-    log = OperationLogModel(
+    # 日志进入异步写入队列，不占用业务会话和额外的提交
+    audit_log_writer.add(
         user_id=user_id,
         user_type=user_type,
         action=action,
@@ -78,37 +91,25 @@ def log_operation(
         detail=detail,
         ip_address=ip_address,
     )
-    session.add(log)
-    session.commit()
 
 
 def get_user_permission(session: Session, token: str) -> UserPermissionInfo:
-    user = get_current_user(session, token)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="无法验证用户凭证",
-        )
-    if user.is_superuser:
+    context = get_auth_context(session, token)
+    if context.is_superuser:
         return UserPermissionInfo(
-            user_id=user.id,
+            user_id=context.user_id,
             is_superuser=True,
             school_ids=[],
         )
-    statement = select(SchoolAdminModel.school_id).where(
-        SchoolAdminModel.user_id == user.id,
-        SchoolAdminModel.is_active == True,
-    )
-    school_ids = [row[0] for row in session.exec(statement).all()]
-    if not school_ids:
+    if not context.school_ids:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="您不是任何学校的分管管理员",
         )
     return UserPermissionInfo(
-        user_id=user.id,
+        user_id=context.user_id,
         is_superuser=False,
-        school_ids=school_ids,
+        school_ids=list(context.school_ids),
     )
 
 
@@ -540,33 +541,51 @@ def create_students_batch(
     if not class_db:
         raise HTTPException(status_code=404, detail="关联的班级不存在")
     perm = check_school_access(session, token, class_db.school_id)
-    success_count = 0
+    # (序号, 错误信息)，最后按序号排序输出
     errors = []
-    existing_numbers = set()
+    # 学号 -> (序号, 学生数据)，同一学号只保留第一条
+    unique_items = {}
     for idx, student_item in enumerate(batch_data.students):
-        try:
-            if student_item.student_number in existing_numbers:
-                errors.append(f"第{idx + 1}条数据「{student_item.name}」学号「{student_item.student_number}」在本次导入中重复")
-                continue
-            statement = select(StudentModel).where(
-                StudentModel.student_number == student_item.student_number
-            )
-            existing_student = session.exec(statement).first()
-            if existing_student:
-                errors.append(f"第{idx + 1}条数据「{student_item.name}」学号「{student_item.student_number}」已存在")
-                continue
-            student_db = StudentModel(
-                name=student_item.name,
-                gender=student_item.gender,
-                student_number=student_item.student_number,
-                class_id=batch_data.class_id,
+        if student_item.student_number in unique_items:
+            errors.append((idx, f"第{idx + 1}条数据「{student_item.name}」学号「{student_item.student_number}」在本次导入中重复"))
+            continue
+        unique_items[student_item.student_number] = (idx, student_item)
+    try:
+        # 一次查询找出数据库中已存在的学号
+        statement = select(StudentModel.student_number).where(
+            any_of(StudentModel.student_number, unique_items.keys())
+        )
+        existing_numbers = set(session.exec(statement).all())
+        rows = [
+            {
+                "id": uuid.uuid7(),
+                "name": student_item.name,
+                "gender": student_item.gender,
+                "student_number": student_number,
+                "class_id": batch_data.class_id,
+            }
+            for student_number, (_, student_item) in unique_items.items()
+            if student_number not in existing_numbers
+        ]
+        # 分块批量插入，并发导入造成的学号冲突由 ON CONFLICT 跳过
+        inserted_numbers = set()
+        for chunk in statement_chunks(rows):
+            statement = (
+                pg_insert(StudentModel)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=["student_number"])
+                .returning(StudentModel.student_number)
             )
-            session.add(student_db)
-            existing_numbers.add(student_item.student_number)
-            success_count += 1
-        except Exception as e:
-            errors.append(f"第{idx + 1}条数据「{student_item.name}」创建失败: {str(e)}")
-    session.commit()
+            inserted_numbers.update(session.exec(statement).scalars().all())
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"批量创建学生失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="批量创建学生失败，请联系管理员！")
+    for student_number, (idx, student_item) in unique_items.items():
+        if student_number not in inserted_numbers:
+            errors.append((idx, f"第{idx + 1}条数据「{student_item.name}」学号「{student_number}」已存在"))
+    success_count = len(inserted_numbers)
     log_operation(
         session=session,
         user_id=perm.user_id,
@@ -576,11 +595,12 @@ def create_students_batch(
         detail=f"成功创建 {success_count} 名学生",
         ip_address=ip_address,
     )
+    errors.sort(key=lambda error: error[0])
     return BatchImportResult(
         success_count=success_count,
         fail_count=len(errors),
         duplicates=[],
-        errors=errors,
+        errors=[message for _, message in errors],
     )
 
 
@@ -895,11 +915,37 @@ def get_exam_scores(
         raise HTTPException(status_code=500, detail="查询考试成绩失败，请联系管理员！")
 
 
+# 成绩中可被覆盖更新的科目字段
+SCORE_SUBJECT_FIELDS = list(ScoreUpdate.model_fields)
+
+
+# 构造成绩写入语句：upsert时已有成绩按给定科目字段覆盖，否则跳过已有成绩
+def _score_insert_statement(values, upsert: bool, fields):
+    statement = pg_insert(ScoreModel).values(values)
+    index_elements = ["student_id", "exam_id"]
+    if upsert:
+        set_ = {field: statement.excluded[field] for field in fields}
+        set_["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements, set_=set_
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+    # xmax为0表示本次新插入的行，否则为冲突后被更新的行
+    return statement.returning(
+        ScoreModel.id,
+        ScoreModel.student_id,
+        ScoreModel.exam_id,
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+
 def create_score(
     session: Session,
     score: ScoreCreate,
     token: str,
     ip_address: str | None = None,
+    upsert: bool = False,
 ) -> ScoreModel:
     student_db = session.get(StudentModel, score.student_id)
     if not student_db:
@@ -910,25 +956,25 @@ def create_score(
     perm = check_school_access(session, token, student_db.class_.school_id)
     check_school_access(session, token, exam_db.school_id)
     try:
-        statement = select(ScoreModel).where(
-            ScoreModel.student_id == score.student_id,
-            ScoreModel.exam_id == score.exam_id,
+        values = score.model_dump(exclude_unset=True)
+        fields = [field for field in SCORE_SUBJECT_FIELDS if field in values]
+        statement = _score_insert_statement(
+            {"id": uuid.uuid7(), **values}, upsert, fields
         )
-        existing_score = session.exec(statement).first()
-        if existing_score:
+        row = session.exec(statement).first()
+        if row is None:
+            session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="该学生在此考试中已有成绩记录",
             )
-        score_db = ScoreModel(**score.model_dump(exclude_unset=True))
-        session.add(score_db)
         session.commit()
-        session.refresh(score_db)
+        score_db = session.get(ScoreModel, row.id)
         log_operation(
             session=session,
             user_id=perm.user_id,
             user_type="superuser" if perm.is_superuser else "school_admin",
-            action="create",
+            action="create" if row.inserted else "update",
             resource_type="score",
             resource_id=score_db.id,
             detail=json.dumps(score.model_dump(mode='json'), ensure_ascii=False),
@@ -948,62 +994,298 @@ def create_scores_batch(
     scores: list[ScoreCreate],
     token: str,
     ip_address: str | None = None,
+    upsert: bool = False,
 ) -> dict:
     perm = get_user_permission(session, token)
-    success_count = 0
     duplicates = []
     errors = []
+    student_ids = {score.student_id for score in scores}
+    exam_ids = {score.exam_id for score in scores}
+    try:
+        # 批量预加载学生所属学校、考试所属学校和已存在的成绩
+        statement = (
+            select(StudentModel.id, ClassModel.school_id)
+            .join(ClassModel, StudentModel.class_id == ClassModel.id)
+            .where(any_of(StudentModel.id, student_ids))
+        )
+        student_schools = dict(session.exec(statement).all())
+        statement = select(ExamModel.id, ExamModel.school_id).where(
+            any_of(ExamModel.id, exam_ids)
+        )
+        exam_schools = dict(session.exec(statement).all())
+        existing_keys = set()
+        if not upsert:
+            statement = select(ScoreModel.student_id, ScoreModel.exam_id).where(
+                any_of(ScoreModel.student_id, student_ids),
+                any_of(ScoreModel.exam_id, exam_ids),
+            )
+            existing_keys = set(session.exec(statement).all())
+    except Exception as e:
+        print(f"批量创建成绩失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="批量创建成绩失败，请联系管理员！")
+    # (学生ID, 考试ID) -> (提交的科目字段, 待写入的成绩)
+    rows = {}
     for score in scores:
-        try:
-            student_db = session.get(StudentModel, score.student_id)
-            if not student_db:
-                errors.append(f"学生ID {score.student_id} 不存在")
+        if score.student_id not in student_schools:
+            errors.append(f"学生ID {score.student_id} 不存在")
+            continue
+        if score.exam_id not in exam_schools:
+            errors.append(f"考试ID {score.exam_id} 不存在")
+            continue
+        if not perm.is_superuser:
+            if student_schools[score.student_id] not in perm.school_ids:
+                errors.append(f"无权操作学生ID {score.student_id}")
                 continue
-            exam_db = session.get(ExamModel, score.exam_id)
-            if not exam_db:
-                errors.append(f"考试ID {score.exam_id} 不存在")
+            if exam_schools[score.exam_id] not in perm.school_ids:
+                errors.append(f"无权操作考试ID {score.exam_id}")
                 continue
-            if not perm.is_superuser:
-                if student_db.class_.school_id not in perm.school_ids:
-                    errors.append(f"无权操作学生ID {score.student_id}")
-                    continue
-                if exam_db.school_id not in perm.school_ids:
-                    errors.append(f"无权操作考试ID {score.exam_id}")
-                    continue
-            statement = select(ScoreModel).where(
-                ScoreModel.student_id == score.student_id,
-                ScoreModel.exam_id == score.exam_id,
+        key = (score.student_id, score.exam_id)
+        # upsert时同一成绩以最后一次提交为准，否则本次提交中的重复成绩同样视为已存在
+        if not upsert and (key in existing_keys or key in rows):
+            duplicates.append(
+                f"学生ID {score.student_id} 在考试ID {score.exam_id} 中已有成绩"
             )
-            existing_score = session.exec(statement).first()
-            if existing_score:
-                duplicates.append(
-                    f"学生ID {score.student_id} 在考试ID {score.exam_id} 中已有成绩"
-                )
-                continue
-            score_db = ScoreModel(**score.model_dump(exclude_unset=True))
-            session.add(score_db)
-            success_count += 1
-        except Exception as e:
-            errors.append(f"处理学生ID {score.student_id} 时出错: {str(e)}")
-    session.commit()
+            continue
+        # 只写入本条成绩实际提交的科目，upsert时未提交的科目保留原有成绩
+        fields = tuple(field for field in SCORE_SUBJECT_FIELDS if field in score.model_fields_set)
+        rows[key] = (
+            fields,
+            {"id": uuid.uuid7(), **score.model_dump(include={"student_id", "exam_id", *fields})},
+        )
+    # 按提交的科目组合分组，每组使用各自的写入列和覆盖列
+    groups = {}
+    for fields, values in rows.values():
+        groups.setdefault(fields, []).append(values)
+    rows = [values for _, values in rows.values()]
+    written_keys = set()
+    updated_count = 0
+    try:
+        for fields, group in groups.items():
+            for chunk in statement_chunks(group):
+                statement = _score_insert_statement(chunk, upsert, fields)
+                for row in session.exec(statement).all():
+                    written_keys.add((row.student_id, row.exam_id))
+                    if not row.inserted:
+                        updated_count += 1
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"批量创建成绩失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="批量创建成绩失败，请联系管理员！")
+    # 预检查之后被并发写入的成绩同样记为重复
+    for row in rows:
+        if (row["student_id"], row["exam_id"]) not in written_keys:
+            duplicates.append(
+                f"学生ID {row['student_id']} 在考试ID {row['exam_id']} 中已有成绩"
+            )
+    success_count = len(written_keys)
+    detail = f"成功创建 {success_count - updated_count} 条成绩记录"
+    if upsert:
+        detail += f"，覆盖更新 {updated_count} 条成绩记录"
     log_operation(
         session=session,
         user_id=perm.user_id,
         user_type="superuser" if perm.is_superuser else "school_admin",
         action="batch_create",
         resource_type="score",
-        detail=f"成功创建 {success_count} 条成绩记录",
+        detail=detail,
         ip_address=ip_address,
     )
     fail_count = len(duplicates) + len(errors)
     return {
         "success_count": success_count,
         "fail_count": fail_count,
+        "updated_count": updated_count,
         "duplicates": duplicates,
         "errors": errors,
     }
 
 
+# 成绩表中学号列可使用的表头
+STUDENT_NUMBER_HEADERS = ("student_number", "学号")
+
+
+# 逐行读取成绩表（CSV/XLSX），提供表头和(行号, 单元格列表)的迭代器，退出时关闭工作簿
+@contextmanager
+def _open_score_sheet(file: BinaryIO, file_format: str):
+    if file_format == "csv":
+        reader = csv.reader(open_text(file))
+        header = next(reader, None)
+        yield header, ((reader.line_num, row) for row in reader)
+        return
+    try:
+        # 只读模式按行流式读取，不会把整个工作簿加载到内存
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"xlsx文件无法解析：{str(e)}")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        yield header, enumerate(rows, start=2)
+    finally:
+        # 只读模式的工作簿会一直持有文件句柄
+        workbook.close()
+
+
+# 单元格内容转为字符串（xlsx中的整数学号会被读取为数字）
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+# 辅助函数：校验成绩表中的数据行，无效和文件内重复的行记入结果，返回(行号, 学号, 成绩)
+def _parse_score_rows(rows, columns: list, fields: list, result: dict):
+    # 本次导入中已出现的学号，用于文件内去重
+    seen_numbers = set()
+    for line_num, cells in rows:
+        row = {field: _cell_text(cells[idx]) if idx < len(cells) else "" for idx, field in columns}
+        number = row.pop("student_number")
+        if not number:
+            # 跳过完全空白的行
+            if any(row.values()):
+                result["errors"].append(f"第{line_num}行缺少学号")
+            continue
+        if number in seen_numbers:
+            result["errors"].append(f"第{line_num}行学号「{number}」在本次导入中重复")
+            continue
+        seen_numbers.add(number)
+        try:
+            # 空单元格视为无成绩，upsert时会清空已有成绩中对应的科目
+            scores = ScoreUpdate.model_validate({k: v or None for k, v in row.items()})
+        except ValidationError as e:
+            invalid = ", ".join(str(err["loc"][0]) for err in e.errors() if err["loc"])
+            result["errors"].append(f"第{line_num}行成绩无效：{invalid}")
+            continue
+        yield line_num, number, scores.model_dump(include=set(fields))
+
+
+# 辅助函数：写入一批导入的成绩并提交，整批写入失败时逐行重试，只有出错的行记为失败
+def _import_score_batch(
+    session: Session,
+    batch: list,
+    perm: UserPermissionInfo,
+    exam_id: uuid.UUID,
+    fields: list,
+    upsert: bool,
+    result: dict,
+):
+    statement = (
+        select(StudentModel.student_number, StudentModel.id, ClassModel.school_id)
+        .join(ClassModel, StudentModel.class_id == ClassModel.id)
+        .where(any_of(StudentModel.student_number, (number for _, number, _ in batch)))
+    )
+    students = {number: (_id, school_id) for number, _id, school_id in session.exec(statement).all()}
+    # 学生ID -> 待写入的成绩，同一条语句中同一学生只能出现一次（否则upsert会失败）
+    values = {}
+    # 与values一一对应的(行号, 学号)，用于报告已有成绩和写入失败的行
+    pending = {}
+    for line_num, number, scores in batch:
+        if number not in students:
+            result["errors"].append(f"第{line_num}行学号「{number}」不存在")
+            continue
+        student_id, school_id = students[number]
+        if not perm.is_superuser and school_id not in perm.school_ids:
+            result["errors"].append(f"第{line_num}行无权操作学号「{number}」的学生")
+            continue
+        if student_id in values:
+            result["errors"].append(f"第{line_num}行学号「{number}」在本次导入中重复")
+            continue
+        values[student_id] = {
+            "id": uuid.uuid7(), "student_id": student_id, "exam_id": exam_id, **scores
+        }
+        pending[student_id] = (line_num, number)
+    if not values:
+        return
+    try:
+        written = session.exec(
+            _score_insert_statement(list(values.values()), upsert, fields)
+        ).all()
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"导入成绩分批失败：{str(e)}")
+        # 逐行重试，定位写入失败的行
+        written = []
+        for student_id, row in values.items():
+            try:
+                written.extend(session.exec(_score_insert_statement([row], upsert, fields)).all())
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                print(f"导入成绩失败：{str(e)}")
+                line_num, number = pending.pop(student_id)
+                result["errors"].append(f"第{line_num}行学号「{number}」成绩写入失败")
+    written_ids = {row.student_id for row in written}
+    result["success_count"] += len(written)
+    result["updated_count"] += sum(1 for row in written if not row.inserted)
+    for student_id, (line_num, number) in pending.items():
+        if student_id not in written_ids:
+            result["duplicates"].append(
+                f"第{line_num}行学号「{number}」在该考试中已有成绩"
+            )
+
+
+# 流式导入考试成绩方法（CSV/XLSX，按学号关联学生），逐批解析校验并写入
+def import_scores(
+    session: Session,
+    file: BinaryIO,
+    file_format: str,
+    exam_id: uuid.UUID,
+    token: str,
+    ip_address: str | None = None,
+    upsert: bool = False,
+) -> dict:
+    exam_db = session.get(ExamModel, exam_id)
+    if not exam_db:
+        raise HTTPException(status_code=404, detail="关联的考试不存在")
+    perm = check_school_access(session, token, exam_db.school_id)
+    result = {
+        "success_count": 0,
+        "fail_count": 0,
+        "updated_count": 0,
+        "duplicates": [],
+        "errors": [],
+    }
+    with upload_errors(), _open_score_sheet(file, file_format) as (header, rows):
+        if not header:
+            raise HTTPException(status_code=400, detail="文件为空或缺少表头")
+        # 表头可使用字段名或科目中文名，无法识别的列（如姓名）忽略
+        header_map = {}
+        for field_name, subject_name in SUBJECT_FIELDS:
+            header_map[field_name] = field_name
+            header_map[subject_name] = field_name
+        for name in STUDENT_NUMBER_HEADERS:
+            header_map[name] = "student_number"
+        columns = [(idx, header_map.get(_cell_text(name))) for idx, name in enumerate(header)]
+        columns = [(idx, field) for idx, field in columns if field]
+        fields = [field for _, field in columns if field != "student_number"]
+        if "student_number" not in (field for _, field in columns):
+            raise HTTPException(status_code=400, detail="表头缺少学号列（student_number或学号）")
+        if not fields:
+            raise HTTPException(status_code=400, detail="表头中没有可识别的科目列")
+        items = _parse_score_rows(rows, columns, fields, result)
+        for batch in chunked(items, IMPORT_BATCH_SIZE):
+            _import_score_batch(session, batch, perm, exam_id, fields, upsert, result)
+    result["fail_count"] = len(result["duplicates"]) + len(result["errors"])
+    detail = f"导入成绩 {result['success_count']} 条"
+    if upsert:
+        detail += f"，其中覆盖更新 {result['updated_count']} 条"
+    log_operation(
+        session=session,
+        user_id=perm.user_id,
+        user_type="superuser" if perm.is_superuser else "school_admin",
+        action="import",
+        resource_type="score",
+        resource_id=exam_id,
+        detail=detail,
+        ip_address=ip_address,
+    )
+    return result
+
+
 def get_scores(
     session: Session,
     token: str,
@@ -1346,6 +1628,8 @@ def create_school_admin(
         )
         session.add(admin_db)
         session.commit()
+        # 分管关系变更后清空权限相关缓存
+        invalidate_auth_caches()
         session.refresh(admin_db)
         session.refresh(user_db)
         log_operation(
@@ -1461,7 +1745,12 @@ def update_school_admin(
         if admin.is_active is not None:
             admin_db.is_active = admin.is_active
             user_db.active = admin.is_active
+        # 分管学校或状态变化时吊销该用户已签发的token
+        if admin.school_id or admin.is_active is not None:
+            revoke_user_tokens(session, admin_db.user_id)
         session.commit()
+        # 分管关系变更后清空权限相关缓存
+        invalidate_auth_caches()
         session.refresh(admin_db)
         session.refresh(user_db)
         school_db = session.get(SchoolModel, admin_db.school_id)
@@ -1507,6 +1796,8 @@ def delete_school_admin(
         if user_db:
             session.delete(user_db)
         session.commit()
+        # 分管关系变更后清空权限相关缓存
+        invalidate_auth_caches()
         log_operation(
             session=session,
             user_id=perm.user_id,
@@ -1540,7 +1831,10 @@ def toggle_school_admin(
         admin_db.is_active = not admin_db.is_active
         if user_db:
             user_db.active = admin_db.is_active
+        revoke_user_tokens(session, admin_db.user_id)
         session.commit()
+        # 分管关系变更后清空权限相关缓存
+        invalidate_auth_caches()
         session.refresh(admin_db)
         if user_db:
             session.refresh(user_db)
@@ -1574,6 +1868,25 @@ def toggle_school_admin(
         raise HTTPException(status_code=500, detail="切换学校分管管理员状态失败，请联系管理员！")
 
 
+# 辅助函数：按(created_at, id)倒序从游标位置取一页日志，多取一条判断是否还有下一页
+def _get_log_page(
+    session: Session, statement, page_size: int, cursor: str | None
+) -> tuple[list[OperationLogModel], str | None]:
+    if cursor:
+        statement = statement.where(
+            tuple_(OperationLogModel.created_at, OperationLogModel.id)
+            < tuple_(*decode_cursor(cursor))
+        )
+    statement = statement.order_by(
+        OperationLogModel.created_at.desc(), OperationLogModel.id.desc()
+    ).limit(page_size + 1)
+    logs = session.exec(statement).all()
+    if len(logs) <= page_size:
+        return logs, None
+    logs = logs[:page_size]
+    return logs, encode_cursor(logs[-1].created_at, logs[-1].id)
+
+
 def get_operation_logs(
     session: Session,
     token: str,
@@ -1582,6 +1895,8 @@ def get_operation_logs(
     user_id: uuid.UUID | None = None,
     action: str | None = None,
     resource_type: str | None = None,
+    use_cursor: bool = False,
+    cursor: str | None = None,
 ) -> dict:
     check_superuser(session, token)
     try:
@@ -1592,6 +1907,18 @@ def get_operation_logs(
             statement = statement.where(OperationLogModel.action == action)
         if resource_type:
             statement = statement.where(OperationLogModel.resource_type == resource_type)
+        # 游标分页：不统计总数、不做OFFSET扫描，耗时与翻页深度无关
+        if use_cursor or cursor:
+            logs, next_cursor = _get_log_page(session, statement, page_size, cursor)
+            return {
+                "total": None,
+                "page": None,
+                "page_size": page_size,
+                "total_pages": None,
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor,
+                "items": logs,
+            }
         total_statement = select(func.count()).select_from(statement.subquery())
         total = session.exec(total_statement).one()
         offset = (page - 1) * page_size
@@ -1609,6 +1936,8 @@ def get_operation_logs(
             "total_pages": total_pages,
             "items": logs,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         session.rollback()
         print(f"查询操作日志失败：{str(e)}")
@@ -1616,17 +1945,20 @@ def get_operation_logs(
 
 
 def get_user_logs(
-    session: Session, target_user_id: uuid.UUID, token: str
-) -> list[OperationLogModel]:
+    session: Session,
+    target_user_id: uuid.UUID,
+    token: str,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> tuple[list[OperationLogModel], str | None]:
     check_superuser(session, token)
     try:
-        statement = (
-            select(OperationLogModel)
-            .where(OperationLogModel.user_id == target_user_id)
-            .order_by(OperationLogModel.created_at.desc())
+        statement = select(OperationLogModel).where(
+            OperationLogModel.user_id == target_user_id
         )
-        logs = session.exec(statement).all()
-        return logs
+        return _get_log_page(session, statement, limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         session.rollback()
         print(f"查询用户操作日志失败：{str(e)}")
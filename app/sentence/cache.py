@@ -0,0 +1,272 @@
+import hashlib
+import random
+import threading
+import time
+import uuid
+from typing import Iterable
+
+from pydantic import TypeAdapter
+from sqlmodel import Session, select
+
+from app.config import fastapi_config
+from app.core.cache import TTLCache
+from app.core.database import engine
+from app.sentence.model import (
+    SentenceCategoryModel,
+    SentenceContentModel,
+    SentenceResponse,
+    CategoryResponse,
+)
+
+# 查询全部分类时使用的采样池键
+ALL_CATEGORY = "all"
+
+
+# 可增量维护的进程内缓存基类：首次使用或失效后从数据库全量加载，之后由后台任务定期重建，
+# 写操作通过增量变更同步，全量加载期间的变更会在加载完成后重放
+class IncrementalCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded_at: float | None = None
+        # 全量重建期间发生的增量变更，重建完成后重放
+        self._journal: list[tuple[str, object]] | None = None
+
+    # 从数据库读取全量数据（在锁外执行）
+    def _load_rows(self, session: Session) -> list:
+        raise NotImplementedError
+
+    # 使用全量数据重建缓存（调用方需持有锁）
+    def _rebuild(self, rows: list):
+        raise NotImplementedError
+
+    # 应用一次增量变更（调用方需持有锁）
+    def _apply(self, op: str, arg):
+        raise NotImplementedError
+
+    # 从数据库全量加载，only_if_missing为True时若等待期间其他线程已完成加载则直接返回
+    def load(self, session: Session, only_if_missing: bool = False):
+        with self._load_lock:
+            if only_if_missing and self._loaded_at is not None:
+                return
+            with self._lock:
+                self._journal = []
+            try:
+                rows = self._load_rows(session)
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                journal = self._journal
+                self._journal = None
+                self._rebuild(rows)
+                # 重放加载期间的增量变更，避免被旧数据覆盖
+                for op, arg in journal:
+                    self._apply(op, arg)
+                self._loaded_at = time.monotonic()
+
+    # 确保缓存可用：仅在首次使用或失效后同步加载，并发请求只会触发一次加载
+    def ensure_loaded(self, session: Session):
+        if self._loaded_at is None:
+            self.load(session, only_if_missing=True)
+
+    # 使用独立会话全量重建（由后台任务定期调用，请求路径不会等待重建）
+    def refresh(self):
+        with Session(engine) as session:
+            self.load(session)
+
+    # 标记缓存失效，下次使用时重新加载
+    def invalidate(self):
+        self._loaded_at = None
+
+    # 记录一次增量变更（调用方需持有锁）
+    def _mutate_locked(self, op: str, arg):
+        self._apply(op, arg)
+        if self._journal is not None:
+            self._journal.append((op, arg))
+
+    def _mutate(self, op: str, arg):
+        with self._lock:
+            self._mutate_locked(op, arg)
+
+
+# 随机句子采样池：按分类在进程内存中缓存已启用的句子，随机抽取时无需访问数据库
+class SentenceSampler(IncrementalCache):
+    def __init__(self):
+        super().__init__()
+        # 句子ID -> 句子数据
+        self._rows: dict[uuid.UUID, SentenceResponse] = {}
+        # 采样池键 -> 句子ID列表（用于O(1)随机下标访问）
+        self._pools: dict[str, list[uuid.UUID]] = {}
+        # 采样池键 -> {句子ID: 在列表中的下标}（用于O(1)删除）
+        self._positions: dict[str, dict[uuid.UUID, int]] = {}
+
+    # 读取全部已启用的句子
+    def _load_rows(self, session: Session) -> list[SentenceResponse]:
+        statement = select(SentenceContentModel).where(
+            SentenceContentModel.is_disabled == False  # noqa: E712
+        )
+        return [
+            SentenceResponse.model_validate(sentence)
+            for sentence in session.exec(statement).all()
+        ]
+
+    def _rebuild(self, rows: list[SentenceResponse]):
+        self._rows, self._pools, self._positions = {}, {}, {}
+        for row in rows:
+            self._put(row)
+
+    # 随机抽取句子
+    def sample(
+        self, session: Session, category_id: str, limit: int
+    ) -> list[SentenceResponse]:
+        self.ensure_loaded(session)
+        with self._lock:
+            pool = self._pools.get(category_id, [])
+            ids = random.sample(pool, min(limit, len(pool)))
+            return [self._rows[_id] for _id in ids]
+
+    # 获取采样池中的单个句子（不存在或已禁用时返回None）
+    def get(self, session: Session, _id: uuid.UUID) -> SentenceResponse | None:
+        self.ensure_loaded(session)
+        with self._lock:
+            return self._rows.get(_id)
+
+    def _pool_add(self, key: str, _id: uuid.UUID):
+        pool = self._pools.setdefault(key, [])
+        positions = self._positions.setdefault(key, {})
+        positions[_id] = len(pool)
+        pool.append(_id)
+
+    def _pool_remove(self, key: str, _id: uuid.UUID):
+        pool = self._pools.get(key)
+        positions = self._positions.get(key)
+        if not pool or _id not in positions:
+            return
+        # 与末尾元素交换后弹出，保证O(1)删除
+        index = positions.pop(_id)
+        last_id = pool.pop()
+        if last_id != _id:
+            pool[index] = last_id
+            positions[last_id] = index
+
+    def _put(self, row: SentenceResponse):
+        self._drop(row.id)
+        self._rows[row.id] = row
+        self._pool_add(str(row.category_id), row.id)
+        self._pool_add(ALL_CATEGORY, row.id)
+
+    def _drop(self, _id: uuid.UUID):
+        row = self._rows.pop(_id, None)
+        if row is None:
+            return
+        self._pool_remove(str(row.category_id), _id)
+        self._pool_remove(ALL_CATEGORY, _id)
+
+    def _apply(self, op: str, arg):
+        if op == "put":
+            if arg.is_disabled:
+                self._drop(arg.id)
+            else:
+                self._put(arg)
+        elif op == "drop":
+            self._drop(arg)
+        elif op == "drop_category":
+            for _id in list(self._pools.get(str(arg), [])):
+                self._drop(_id)
+        elif op == "likes":
+            _id, delta = arg
+            row = self._rows.get(_id)
+            if row is not None:
+                likes = max(row.likes + delta, 0)
+                self._rows[_id] = row.model_copy(update={"likes": likes})
+        elif op == "set_likes":
+            _id, likes = arg
+            row = self._rows.get(_id)
+            if row is not None:
+                self._rows[_id] = row.model_copy(update={"likes": likes})
+
+    # 新增或更新句子（禁用的句子会被移出采样池）
+    def upsert(self, sentence: SentenceContentModel | SentenceResponse):
+        self._mutate("put", SentenceResponse.model_validate(sentence))
+
+    def upsert_many(self, sentences: Iterable[SentenceContentModel | SentenceResponse]):
+        for sentence in sentences:
+            self.upsert(sentence)
+
+    # 从采样池中移除句子
+    def discard(self, ids: Iterable[uuid.UUID]):
+        for _id in ids:
+            self._mutate("drop", _id)
+
+    # 调整句子的点赞数，返回调整后的点赞数（句子不在采样池中时返回None）
+    def adjust_likes(self, _id: uuid.UUID, delta: int) -> int | None:
+        with self._lock:
+            self._apply("likes", (_id, delta))
+            row = self._rows.get(_id)
+            if row is None:
+                return None
+            # 重放时写入调整后的绝对值：点赞可能在全量读取之前已经落库，重放增量会重复计数
+            if self._journal is not None:
+                self._journal.append(("set_likes", (_id, row.likes)))
+            return row.likes
+
+    # 移除整个分类下的句子
+    def discard_category(self, category_id: uuid.UUID):
+        self._mutate("drop_category", category_id)
+
+
+# 分类目录缓存：缓存序列化后的分类列表及其ETag，分类增删改时主动失效
+class CategoryCatalog:
+    _adapter = TypeAdapter(list[CategoryResponse])
+
+    def __init__(self, refresh_seconds: int):
+        self._lock = threading.Lock()
+        self._refresh_seconds = refresh_seconds
+        # 每次失效时递增，用于丢弃失效前开始的加载结果
+        self._version = 0
+        self._loaded_at: float | None = None
+        self._body: bytes = b"[]"
+        self._etag: str = ""
+
+    # 获取分类列表的JSON数据和ETag
+    def get(self, session: Session) -> tuple[bytes, str]:
+        with self._lock:
+            if self._loaded_at is not None and (
+                time.monotonic() - self._loaded_at <= self._refresh_seconds
+            ):
+                return self._body, self._etag
+            version = self._version
+        categories = session.exec(select(SentenceCategoryModel)).all()
+        body = self._adapter.dump_json(
+            [CategoryResponse.model_validate(category) for category in categories]
+        )
+        # ETag取内容哈希，多进程部署时同样的数据得到同样的ETag
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        with self._lock:
+            if version == self._version:
+                self._body, self._etag = body, etag
+                self._loaded_at = time.monotonic()
+        return body, etag
+
+    # 分类发生变化时调用，下次查询重新加载
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._loaded_at = None
+
+
+sentence_sampler = SentenceSampler()
+
+# 句子统计结果缓存：键为用户范围（超级管理员为"all"，普通用户为句子用户ID）
+sentence_stats_cache = TTLCache(
+    maxsize=1024, ttl=fastapi_config.SENTENCE_STATS_CACHE_SECONDS
+)
+
+# 游标分页的总条数缓存：键为(用户范围, 搜索词, 分类, 状态)，返回近似总数
+sentence_count_cache = TTLCache(
+    maxsize=1024, ttl=fastapi_config.SENTENCE_COUNT_CACHE_SECONDS
+)
+
+category_catalog = CategoryCatalog(fastapi_config.CATEGORY_CACHE_SECONDS)
@@ -0,0 +1,216 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, Integer, String, Uuid, column, values, tuple_
+from sqlmodel import Session, select, insert, update, delete, func
+
+from app.config import fastapi_config
+from app.core.batching import statement_chunks
+from app.core.database import engine
+from app.sentence.model import SentenceContentModel, SentenceLikeModel
+
+
+# 获取今天的开始时间
+def today_start() -> datetime:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# 点赞写缓冲：在内存中合并点赞记录和点赞数增量，由后台任务定期批量写入数据库
+class LikeBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # 待插入的点赞记录：(句子ID, IP) -> (记录ID, 点赞时间)
+        self._likes: dict[tuple[uuid.UUID, str], tuple[uuid.UUID, datetime]] = {}
+        # 待删除的已落库点赞记录：(句子ID, IP, 当天开始时间)
+        self._unlikes: set[tuple[uuid.UUID, str, datetime]] = set()
+        # 句子ID -> 点赞数增量
+        self._deltas: dict[uuid.UUID, int] = {}
+
+    # 判断今天是否有尚未落库的点赞
+    def has_pending_like(self, sentence_id: uuid.UUID, ip_address: str) -> bool:
+        with self._lock:
+            pending = self._likes.get((sentence_id, ip_address))
+            return pending is not None and pending[1] >= today_start()
+
+    # 判断今天已落库的点赞是否已被取消（等待删除）
+    def has_pending_unlike(self, sentence_id: uuid.UUID, ip_address: str) -> bool:
+        with self._lock:
+            return (sentence_id, ip_address, today_start()) in self._unlikes
+
+    # 获取句子尚未落库的点赞数增量
+    def pending_delta(self, sentence_id: uuid.UUID) -> int:
+        with self._lock:
+            return self._deltas.get(sentence_id, 0)
+
+    # 记录一次点赞，今天已有未落库的同一点赞时不重复记录并返回False
+    def add_like(self, sentence_id: uuid.UUID, ip_address: str) -> bool:
+        with self._lock:
+            pending = self._likes.get((sentence_id, ip_address))
+            if pending is not None and pending[1] >= today_start():
+                return False
+            self._likes[(sentence_id, ip_address)] = (uuid.uuid7(), datetime.now())
+            self._deltas[sentence_id] = self._deltas.get(sentence_id, 0) + 1
+            return True
+
+    # 记录一次取消点赞：未落库的点赞直接抵消，已落库的点赞排队删除，
+    # 同一点赞已在等待删除时不重复记录并返回False
+    def remove_like(self, sentence_id: uuid.UUID, ip_address: str) -> bool:
+        with self._lock:
+            if self._likes.pop((sentence_id, ip_address), None) is None:
+                key = (sentence_id, ip_address, today_start())
+                if key in self._unlikes:
+                    return False
+                self._unlikes.add(key)
+            self._deltas[sentence_id] = self._deltas.get(sentence_id, 0) - 1
+            return True
+
+    # 取出当前缓冲的全部数据
+    def _drain(self):
+        with self._lock:
+            likes, self._likes = self._likes, {}
+            unlikes, self._unlikes = self._unlikes, set()
+            deltas, self._deltas = self._deltas, {}
+        return likes, unlikes, deltas
+
+    # 写入失败时将数据放回缓冲，等待下次重试
+    def _restore(self, likes, unlikes, deltas):
+        with self._lock:
+            for key, value in likes.items():
+                self._likes.setdefault(key, value)
+            self._unlikes |= unlikes
+            for sentence_id, delta in deltas.items():
+                self._deltas[sentence_id] = self._deltas.get(sentence_id, 0) + delta
+
+    # 将缓冲数据批量写入数据库
+    def flush(self):
+        with self._flush_lock:
+            likes, unlikes, deltas = self._drain()
+            deltas = {k: v for k, v in deltas.items() if v}
+            if not (likes or unlikes or deltas):
+                return
+            try:
+                with Session(engine) as session:
+                    self._write(session, likes, unlikes, deltas)
+                    session.commit()
+            except Exception:
+                self._restore(likes, unlikes, deltas)
+                raise
+
+    @staticmethod
+    def _write(session: Session, likes, unlikes, deltas):
+        # 先删除被取消的点赞记录（同一IP可能取消后又重新点赞）
+        unlikes_by_day: dict[datetime, list[tuple[uuid.UUID, str]]] = {}
+        for sentence_id, ip_address, day in unlikes:
+            unlikes_by_day.setdefault(day, []).append((sentence_id, ip_address))
+        for day, keys in unlikes_by_day.items():
+            session.exec(
+                delete(SentenceLikeModel).where(
+                    tuple_(
+                        SentenceLikeModel.sentence_id, SentenceLikeModel.ip_address
+                    ).in_(keys),
+                    SentenceLikeModel.created_at >= day,
+                    SentenceLikeModel.created_at < day + timedelta(days=1),
+                )
+            )
+
+        # 批量插入点赞记录，只保留仍然存在的句子
+        like_rows = [
+            (like_id, sentence_id, ip_address, created_at)
+            for (sentence_id, ip_address), (like_id, created_at) in likes.items()
+        ]
+        for chunk in statement_chunks(like_rows):
+            pending_likes = values(
+                column("id", Uuid),
+                column("sentence_id", Uuid),
+                column("ip_address", String),
+                column("created_at", DateTime),
+                name="pending_likes",
+            ).data(chunk)
+            session.exec(
+                insert(SentenceLikeModel).from_select(
+                    ["id", "sentence_id", "ip_address", "created_at"],
+                    select(
+                        pending_likes.c.id,
+                        pending_likes.c.sentence_id,
+                        pending_likes.c.ip_address,
+                        pending_likes.c.created_at,
+                    ).join(
+                        SentenceContentModel,
+                        SentenceContentModel.id == pending_likes.c.sentence_id,
+                    ),
+                )
+            )
+
+        # 一条语句批量累加点赞数
+        delta_rows = list(deltas.items())
+        for chunk in statement_chunks(delta_rows):
+            pending_deltas = values(
+                column("sentence_id", Uuid),
+                column("delta", Integer),
+                name="pending_deltas",
+            ).data(chunk)
+            session.exec(
+                update(SentenceContentModel)
+                .where(SentenceContentModel.id == pending_deltas.c.sentence_id)
+                .values(
+                    likes=func.greatest(
+                        SentenceContentModel.likes + pending_deltas.c.delta, 0
+                    )
+                )
+            )
+
+
+# 当天点赞去重索引：在内存中记录今天已点赞的(句子ID, IP)，每天零点自动轮换
+class LikeDedupIndex:
+    def __init__(self, db_fallback: bool):
+        self._lock = threading.Lock()
+        self._db_fallback = db_fallback
+        self._day: datetime | None = None
+        self._keys: set[tuple[uuid.UUID, str]] = set()
+
+    # 跨天时清空索引（新的一天尚无点赞记录）
+    def _rotate(self):
+        today = today_start()
+        if self._day is not None and self._day != today:
+            self._keys = set()
+            self._day = today
+
+    # 启动时从数据库加载今天的点赞记录
+    def seed(self):
+        today = today_start()
+        with Session(engine) as session:
+            rows = session.exec(
+                select(SentenceLikeModel.sentence_id, SentenceLikeModel.ip_address).where(
+                    SentenceLikeModel.created_at >= today
+                )
+            ).all()
+        with self._lock:
+            self._keys = {(sentence_id, ip_address) for sentence_id, ip_address in rows}
+            self._day = today
+
+    # 查询今天是否已点赞；索引未就绪（未成功加载）时返回None
+    def contains(self, sentence_id: uuid.UUID, ip_address: str) -> bool | None:
+        with self._lock:
+            self._rotate()
+            if self._day is None:
+                return None
+            if (sentence_id, ip_address) in self._keys:
+                return True
+            # 多进程部署时其他进程的点赞不在本进程索引中，可配置回退到数据库确认
+            return None if self._db_fallback else False
+
+    def add(self, sentence_id: uuid.UUID, ip_address: str):
+        with self._lock:
+            self._rotate()
+            self._keys.add((sentence_id, ip_address))
+
+    def remove(self, sentence_id: uuid.UUID, ip_address: str):
+        with self._lock:
+            self._rotate()
+            self._keys.discard((sentence_id, ip_address))
+
+
+like_buffer = LikeBuffer()
+like_dedup_index = LikeDedupIndex(fastapi_config.LIKE_DEDUP_DB_FALLBACK)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index
 from sqlmodel import SQLModel, Field, func, Relationship
 import uuid
 from datetime import datetime
@@ -30,6 +30,10 @@ class SentenceCategoryModel(SQLModel, table=True):
 # 数据库句子内容表模型
 class SentenceContentModel(SQLModel, table=True):
     __tablename__ = "sentence_content"
+    __table_args__ = (
+        # 游标分页按(created_at, id)排序和定位使用的复合索引
+        Index("ix_sentence_content_created_at_id", "created_at", "id"),
+    )
     id: uuid.UUID = Field(
         default_factory=uuid.uuid7, primary_key=True, index=True, unique=True
     )
@@ -100,6 +104,15 @@ class SentenceUpdateAndCreate(SQLModel):
 # 数据库句子点赞记录表模型
 class SentenceLikeModel(SQLModel, table=True):
     __tablename__ = "sentence_like"
+    __table_args__ = (
+        # 每日点赞去重查询使用的复合索引
+        Index(
+            "ix_sentence_like_sentence_id_ip_address_created_at",
+            "sentence_id",
+            "ip_address",
+            "created_at",
+        ),
+    )
     id: uuid.UUID = Field(
         default_factory=uuid.uuid7, primary_key=True, index=True, unique=True
     )
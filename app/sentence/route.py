@@ -1,6 +1,15 @@
 import uuid
 from typing import Annotated
-from fastapi import APIRouter, status, Query, Depends, Request
+from fastapi import (
+    APIRouter,
+    status,
+    Query,
+    Depends,
+    Request,
+    Response,
+    UploadFile,
+    Form,
+)
 from pydantic import BaseModel
 
 from app.sentence.model import (
@@ -10,6 +19,7 @@ from app.sentence.model import (
     CategoryUpdateAndCreate,
 )
 from app.core.database import SessionDep
+from app.core.upload import resolve_upload_format
 import app.sentence.server as server
 from app.user.route import oauth2_scheme
 
@@ -63,9 +73,15 @@ def update_sentence_category_route(
     response_model=list[CategoryResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_sentence_category_route(session: SessionDep):
-    result = server.get_sentence_category(session)
-    return result
+def get_sentence_category_route(session: SessionDep, request: Request):
+    body, etag = server.get_sentence_category(session)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    # 客户端缓存的ETag与当前一致时返回304，无需传输分类列表
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @sentence_route.post(
@@ -83,6 +99,34 @@ def create_sentence_route(
     return sentence
 
 
+# 根据文件扩展名推断导入格式
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+@sentence_route.post(
+    "/import",
+    summary="流式批量导入句子路由（NDJSON/CSV）",
+    description="逐行读取上传文件并分批写入，CSV需包含content列，可选category_id、from_source、from_who、is_disabled列",
+    status_code=status.HTTP_200_OK,
+)
+def import_sentences_route(
+    session: SessionDep,
+    file: UploadFile,
+    file_format: str = Query(
+        None, description="文件格式（csv或ndjson），不传入时根据文件扩展名判断"
+    ),
+    category_id: uuid.UUID | None = Form(
+        None, description="默认分类ID，行内未提供分类时使用"
+    ),
+    token: str = Depends(oauth2_scheme),
+):
+    file_format = resolve_upload_format(file, file_format, IMPORT_FORMATS)
+    result = server.import_sentences(
+        session, file.file, file_format, token, category_id
+    )
+    return result
+
+
 @sentence_route.delete(
     "/{_id}",
     summary="单个删除句子路由",
@@ -140,8 +184,28 @@ def get_sentence_paginated_route(
         None, description="分类ID，传入'all'或不传入则查询所有分类"
     ),
     is_disabled: bool = Query(None, description="句子状态，true为禁用，false为启用"),
+    use_cursor: bool = Query(
+        False, description="是否使用游标分页（按创建时间定位，深分页耗时恒定）"
+    ),
+    cursor: str = Query(
+        None, description="游标分页的位置，取上一页返回的next_cursor，传入时自动启用游标分页"
+    ),
+    with_total: bool = Query(
+        False, description="游标分页时是否返回总条数（短时缓存的近似值）"
+    ),
     token: str = Depends(oauth2_scheme),
 ):
+    if use_cursor or cursor:
+        return server.get_sentence_cursor_page(
+            session,
+            page_size,
+            token,
+            cursor,
+            with_total,
+            search,
+            category_id,
+            is_disabled,
+        )
     result = server.get_sentence_paginated(
         session, page, page_size, token, search, category_id, is_disabled
     )
@@ -189,6 +253,62 @@ def batch_delete_sentences_route(
     return result
 
 
+# 按筛选条件批量操作的请求模型（筛选条件与分页查询一致）
+class SentenceFilterRequest(BaseModel):
+    search: str | None = None
+    category_id: str | None = None
+    is_disabled: bool | None = None
+    dry_run: bool = False  # 为true时只返回匹配数量，不执行操作
+
+
+# 按筛选条件批量更新句子状态请求模型
+class FilterUpdateStatusRequest(SentenceFilterRequest):
+    set_disabled: bool  # 目标状态
+
+
+@sentence_route.post(
+    "/admin/bulk/status",
+    summary="按筛选条件批量更新句子状态路由",
+    status_code=status.HTTP_200_OK,
+)
+def bulk_update_sentence_status_route(
+    session: SessionDep,
+    request: FilterUpdateStatusRequest,
+    token: str = Depends(oauth2_scheme),
+):
+    result = server.bulk_update_sentence_status_by_filter(
+        session,
+        request.set_disabled,
+        token,
+        request.search,
+        request.category_id,
+        request.is_disabled,
+        request.dry_run,
+    )
+    return result
+
+
+@sentence_route.post(
+    "/admin/bulk/delete",
+    summary="按筛选条件批量删除句子路由",
+    status_code=status.HTTP_200_OK,
+)
+def bulk_delete_sentences_route(
+    session: SessionDep,
+    request: SentenceFilterRequest,
+    token: str = Depends(oauth2_scheme),
+):
+    result = server.bulk_delete_sentences_by_filter(
+        session,
+        token,
+        request.search,
+        request.category_id,
+        request.is_disabled,
+        request.dry_run,
+    )
+    return result
+
+
 @sentence_route.get(
     "/admin/stats",
     summary="获取应用统计信息路由",
@@ -0,0 +1,153 @@
+import heapq
+import uuid
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from sqlmodel import Session, select
+
+from app.sentence.cache import IncrementalCache
+from app.sentence.model import SentenceContentModel
+
+
+# 将文本切分为单字和相邻二字（bigram）
+def _grams(text: str) -> set[str]:
+    grams = set(text)
+    grams.update(text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+# 搜索结果在内存中筛选和排序时使用的句子属性
+class SentenceMeta(NamedTuple):
+    created_at: datetime
+    category_id: uuid.UUID
+    is_disabled: bool
+    sentence_user_id: uuid.UUID | None
+
+
+# 句子内容搜索索引：基于单字/二字的进程内倒排索引，替代无法走索引的 ILIKE '%term%' 全表扫描
+class SentenceSearchIndex(IncrementalCache):
+    def __init__(self):
+        super().__init__()
+        # 句子ID -> 小写后的句子内容（用于校验候选结果）
+        self._contents: dict[uuid.UUID, str] = {}
+        # 单字/二字 -> 包含它的句子ID集合
+        self._postings: dict[str, set[uuid.UUID]] = {}
+        # 句子ID -> 句子属性（命中数量较多时在内存中完成筛选、计数和分页）
+        self._meta: dict[uuid.UUID, SentenceMeta] = {}
+
+    def _load_rows(self, session: Session) -> list:
+        statement = select(
+            SentenceContentModel.id,
+            SentenceContentModel.content,
+            SentenceContentModel.created_at,
+            SentenceContentModel.category_id,
+            SentenceContentModel.is_disabled,
+            SentenceContentModel.sentence_user_id,
+        )
+        return list(session.exec(statement).all())
+
+    def _rebuild(self, rows: list):
+        self._contents, self._postings, self._meta = {}, {}, {}
+        for _id, content, *meta in rows:
+            self._put(_id, content, SentenceMeta(*meta))
+
+    def _put(self, _id: uuid.UUID, content: str, meta: SentenceMeta):
+        # 更新句子时不会修改归属用户，未提供时沿用原有的值
+        if meta.sentence_user_id is None and _id in self._meta:
+            meta = meta._replace(sentence_user_id=self._meta[_id].sentence_user_id)
+        self._drop(_id)
+        content = content.lower()
+        self._contents[_id] = content
+        self._meta[_id] = meta
+        for gram in _grams(content):
+            self._postings.setdefault(gram, set()).add(_id)
+
+    def _drop(self, _id: uuid.UUID):
+        content = self._contents.pop(_id, None)
+        if content is None:
+            return
+        self._meta.pop(_id, None)
+        for gram in _grams(content):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _apply(self, op: str, arg):
+        if op == "put":
+            self._put(*arg)
+        elif op == "drop":
+            self._drop(arg)
+
+    # 搜索包含关键词的句子ID；关键词含 LIKE 通配符时返回None，由调用方回退到 ILIKE
+    def search(self, session: Session, term: str) -> set[uuid.UUID] | None:
+        if "%" in term or "_" in term:
+            return None
+        self.ensure_loaded(session)
+        term = term.lower()
+        grams = {term} if len(term) == 1 else {term[i : i + 2] for i in range(len(term) - 1)}
+        with self._lock:
+            postings = [self._postings.get(gram) for gram in grams]
+            if not all(postings):
+                return set()
+            # 从最短的倒排列表开始求交集
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for ids in postings[1:]:
+                candidates &= ids
+                if not candidates:
+                    return set()
+            # 二字命中不代表整体连续出现，再做一次子串校验
+            return {_id for _id in candidates if term in self._contents[_id]}
+
+    # 在命中的句子中按条件筛选，返回按(created_at, id)倒序排列的前limit个排序键
+    # 和满足条件的总数，全部在内存中完成
+    def top_matches(
+        self,
+        ids: Iterable[uuid.UUID],
+        limit: int,
+        sentence_user_id: uuid.UUID | None = None,
+        category_id: str | None = None,
+        is_disabled: bool | None = None,
+        before: tuple[datetime, uuid.UUID] | None = None,
+    ) -> tuple[list[tuple[datetime, uuid.UUID]], int]:
+        with self._lock:
+            keys = []
+            for _id in ids:
+                meta = self._meta.get(_id)
+                if meta is None:
+                    continue
+                if sentence_user_id is not None and meta.sentence_user_id != sentence_user_id:
+                    continue
+                if category_id is not None and str(meta.category_id) != category_id:
+                    continue
+                if is_disabled is not None and meta.is_disabled != is_disabled:
+                    continue
+                keys.append((meta.created_at, _id))
+        total = len(keys)
+        if before is not None:
+            keys = [key for key in keys if key < before]
+        return heapq.nlargest(limit, keys), total
+
+    # 新增或更新句子；sentence_user_id为None时沿用索引中原有的归属用户
+    def upsert(self, sentence, sentence_user_id: uuid.UUID | None = None):
+        meta = SentenceMeta(
+            sentence.created_at,
+            sentence.category_id,
+            sentence.is_disabled,
+            getattr(sentence, "sentence_user_id", None) or sentence_user_id,
+        )
+        self._mutate("put", (sentence.id, sentence.content, meta))
+
+    def upsert_many(self, sentences: Iterable, sentence_user_id: uuid.UUID | None = None):
+        for sentence in sentences:
+            self.upsert(sentence, sentence_user_id)
+
+    # 从索引中移除句子
+    def discard(self, ids: Iterable[uuid.UUID]):
+        for _id in ids:
+            self._mutate("drop", _id)
+
+
+sentence_search_index = SentenceSearchIndex()
@@ -1,30 +1,45 @@
+import csv
+import json
 import uuid
-from datetime import datetime
+from typing import BinaryIO
 
 from fastapi import HTTPException, status
-from sqlmodel import Session, select, func
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select, update, delete, func, and_, tuple_
 from app.sentence.model import (
     SentenceUpdateAndCreate,
     CategoryUpdateAndCreate,
     SentenceCategoryModel,
     SentenceContentModel,
     SentenceLikeModel,
+    SentenceResponse,
 )
+from app.sentence.cache import (
+    sentence_sampler,
+    sentence_stats_cache,
+    sentence_count_cache,
+    category_catalog,
+)
+from app.sentence.search import sentence_search_index
+from app.sentence.like import like_buffer, like_dedup_index, today_start
+from app.config import fastapi_config
+from app.core.batching import IMPORT_BATCH_SIZE, chunked, statement_chunks
+from app.core.database import any_of
+from app.core.upload import open_text, upload_errors
+from app.core.pagination import encode_cursor, decode_cursor
 from app.user import server as user_server
 
 
-# 获取基础信息方法
+# 获取基础信息方法（来自缓存的权限上下文，不加载用户的句子集合）
 def get_basic_info(session: Session, token: str):
-    user_info = user_server.get_current_user(session, token)
-    sentence_user_is_superuser = user_info.sentence_user_config.is_superuser
-    user_is_superuser = user_info.is_superuser
-    sentence_user_sentence_content = user_info.sentence_user_config.sentences
-    sentence_user_id = user_info.sentence_user_config.id
+    context = user_server.get_auth_context(session, token)
+    if context.sentence_user_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="操作被禁止")
     return (
-        sentence_user_is_superuser,
-        user_is_superuser,
-        sentence_user_id,
-        sentence_user_sentence_content,
+        context.sentence_is_superuser,
+        context.is_superuser,
+        context.sentence_user_id,
     )
 
 
@@ -51,6 +66,7 @@ def create_sentence_category(
             session.add(category_db)
             session.commit()
             session.refresh(category_db)
+            category_catalog.invalidate()
             return category_db
 
         except HTTPException:
@@ -77,6 +93,9 @@ def delete_sentence_category(session: Session, _id: uuid.UUID, token: str):
                 raise HTTPException(status_code=404, detail="Category not found")
             session.delete(category_db)
             session.commit()
+            category_catalog.invalidate()
+            sentence_sampler.discard_category(_id)
+            sentence_search_index.invalidate()
             return {"msg": "分类删除成功", "category": category_db.model_dump()}
         except Exception as e:
             session.rollback()
@@ -114,6 +133,7 @@ def update_sentence_category(
             category_db.sqlmodel_update(category_dict)
             session.commit()
             session.refresh(category_db)
+            category_catalog.invalidate()
             return category_db
         except HTTPException:
             raise
@@ -124,18 +144,53 @@ def update_sentence_category(
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="操作被禁止")
 
 
-# 查询分类方法
-def get_sentence_category(session: Session):
+# 查询分类方法，返回分类列表的JSON数据和ETag
+def get_sentence_category(session: Session) -> tuple[bytes, str]:
     try:
-        statement = select(SentenceCategoryModel)
-        category_db = session.exec(statement).all()
-        return category_db
+        return category_catalog.get(session)
     except Exception as e:
         session.rollback()
         print(f"查询分类失败：{str(e)}")
         raise HTTPException(status_code=500, detail="查询分类失败，请联系管理员！")
 
 
+# 辅助函数：批量插入句子，内容已存在的句子跳过，返回实际插入的句子
+def _insert_sentences(
+    session: Session,
+    items: list[SentenceUpdateAndCreate],
+    sentence_user_id: uuid.UUID,
+    is_superuser: bool,
+) -> list[SentenceResponse]:
+    rows = [
+        {
+            "id": uuid.uuid7(),
+            # 非超级用户创建的句子默认禁用，等待审核
+            "is_disabled": item.is_disabled if is_superuser else True,
+            "content": item.content,
+            "from_source": item.from_source,
+            "from_who": item.from_who,
+            "likes": 0,
+            "category_id": item.category_id,
+            "sentence_user_id": sentence_user_id,
+        }
+        for item in items
+    ]
+    inserted = []
+    for chunk in statement_chunks(rows):
+        # INSERT ... ON CONFLICT (content) DO NOTHING RETURNING，一次往返完成插入和查重
+        statement = (
+            pg_insert(SentenceContentModel)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["content"])
+            .returning(*SentenceContentModel.__table__.columns)
+        )
+        inserted.extend(
+            SentenceResponse.model_validate(dict(row._mapping))
+            for row in session.exec(statement).all()
+        )
+    return inserted
+
+
 # 创建句子方法
 def create_sentence(
     session: Session,
@@ -159,8 +214,6 @@ def create_sentence(
         "internal_duplicates": [],
         "db_duplicates": [],
     }
-    # 存储要创建的句子对象
-    sentence_objects = []
     try:
         # 第一步：去除数组内重复的content，仅保留一个
         unique_content_items = {}
@@ -171,61 +224,25 @@ def create_sentence(
                 result["internal_duplicates"].append(item.content)
         # 获取去重后的内容列表
         unique_items = list(unique_content_items.values())
-        # 提取所有待创建的句子内容
-        contents = [item.content for item in unique_items]
 
-        # 检查数据库中已存在的内容
-        if contents:
-            statement = select(SentenceContentModel.content).where(
-                SentenceContentModel.content.in_(contents)
-            )
-            # 正确获取查询结果中的内容字符串
-            existing_contents = []
-            for row in session.exec(statement).all():
-                # 兼容不同SQLAlchemy版本的返回格式（可能是元组或单个值）
-                if isinstance(row, (tuple, list)):
-                    existing_contents.append(row[0])
-                else:
-                    existing_contents.append(row)
-            # 转换为集合提高查询效率
-            existing_contents_set = set(existing_contents)
-            # 找出和数据库重复的内容
-            db_duplicates = [
-                content for content in contents if content in existing_contents_set
-            ]
-            result["db_duplicates"] = db_duplicates
-
-            # 过滤出数据库中不存在的内容
-            non_duplicate_items = [
-                item
-                for item in unique_items
-                if item.content not in existing_contents_set
-            ]
-        else:
-            non_duplicate_items = []
-
-        # 第二步：处理每个不重复的句子对象
-        for item in non_duplicate_items:
-            # 设置权限相关字段
-            if not is_superuser:
-                item.is_disabled = True
-            # 初始化点赞数
-            item.likes = 0
-            # 转换为字典并创建数据库模型对象
-            sentence_dict = item.model_dump(exclude_unset=True)
-            sentence_db = SentenceContentModel(
-                **sentence_dict, sentence_user_id=sentence_user_id
-            )
-            sentence_objects.append(sentence_db)
+        # 第二步：批量插入，数据库中已存在的内容由 ON CONFLICT 跳过
+        inserted = _insert_sentences(
+            session, unique_items, sentence_user_id, is_superuser
+        )
+        session.commit()
 
-        # 第三步：批量添加并提交
-        if sentence_objects:
-            session.add_all(sentence_objects)
-            session.commit()
-            # 刷新所有对象以获取数据库生成的字段（如id）
-            for obj in sentence_objects:
-                session.refresh(obj)
-            result["success_count"] = len(sentence_objects)
+        # 第三步：未被插入的内容即为和数据库重复的内容
+        inserted_contents = {sentence.content for sentence in inserted}
+        result["db_duplicates"] = [
+            item.content
+            for item in unique_items
+            if item.content not in inserted_contents
+        ]
+        result["success_count"] = len(inserted)
+
+        # 同步更新随机句子采样池和搜索索引
+        sentence_sampler.upsert_many(inserted)
+        sentence_search_index.upsert_many(inserted, sentence_user_id)
 
         # 返回处理结果
         return result
@@ -239,25 +256,171 @@ def create_sentence(
         raise HTTPException(status_code=400, detail="创建句子失败，请联系管理员！")
 
 
-# 删除句子方法
+# 辅助函数：逐行解析上传的NDJSON/CSV文件，返回(行号, 原始数据)
+def _iter_import_rows(text_stream, file_format: str):
+    if file_format == "csv":
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            # 跳过完全空白的行（表格软件导出的文件末尾常带有只有分隔符的行）
+            if not any((value or "").strip() for key, value in row.items() if key):
+                continue
+            yield reader.line_num, row
+        return
+    for line_num, line in enumerate(text_stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_num, None
+
+
+# 辅助函数：校验导入的句子数据，无效和文件内重复的行记入结果，返回(行号, 句子数据)
+def _parse_import_rows(rows, default_category_id: uuid.UUID | None, result: dict):
+    # 本次导入中已出现的内容，用于文件内去重
+    seen_contents = set()
+    for line_num, raw in rows:
+        if not isinstance(raw, dict):
+            result["errors"].append(f"第{line_num}行不是有效的JSON对象")
+            continue
+        # 去掉空值，缺省分类使用表单中指定的分类
+        data = {k: v for k, v in raw.items() if k and v not in (None, "")}
+        if "category_id" not in data and default_category_id:
+            data["category_id"] = default_category_id
+        try:
+            item = SentenceUpdateAndCreate.model_validate(data)
+        except ValidationError as e:
+            fields = ", ".join(str(err["loc"][0]) for err in e.errors() if err["loc"])
+            result["errors"].append(f"第{line_num}行数据无效：{fields}")
+            continue
+        if item.content in seen_contents:
+            result["internal_duplicates"].append(item.content)
+            continue
+        seen_contents.add(item.content)
+        yield line_num, item
+
+
+# 辅助函数：写入一批导入的句子并提交，写入失败时回滚并记录错误，不影响其他批次
+def _import_sentence_batch(
+    session: Session,
+    batch: list,
+    sentence_user_id: uuid.UUID,
+    is_superuser: bool,
+    known_categories: set,
+    result: dict,
+):
+    # 写入前一次查询校验分类是否存在，分类不存在的行单独报错，不影响同一批次的其他行
+    unknown = {item.category_id for _, item in batch} - known_categories
+    if unknown:
+        statement = select(SentenceCategoryModel.id).where(
+            any_of(SentenceCategoryModel.id, unknown)
+        )
+        known_categories.update(session.exec(statement).all())
+    items = []
+    for line_num, item in batch:
+        if item.category_id not in known_categories:
+            result["errors"].append(f"第{line_num}行分类ID「{item.category_id}」不存在")
+            continue
+        items.append(item)
+    if not items:
+        return
+    try:
+        inserted = _insert_sentences(session, items, sentence_user_id, is_superuser)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"导入句子分批失败：{str(e)}")
+        result["errors"].append(f"{len(items)}条句子写入失败")
+        return
+    inserted_contents = {sentence.content for sentence in inserted}
+    result["db_duplicates"].extend(
+        item.content for item in items if item.content not in inserted_contents
+    )
+    result["success_count"] += len(inserted)
+    sentence_sampler.upsert_many(inserted)
+    sentence_search_index.upsert_many(inserted, sentence_user_id)
+
+
+# 流式批量导入句子方法（NDJSON/CSV），逐行解析并分批插入，适用于大规模语料导入
+def import_sentences(
+    session: Session,
+    file: BinaryIO,
+    file_format: str,
+    token: str,
+    default_category_id: uuid.UUID | None = None,
+):
+    # 获取用户基础信息
+    (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
+        get_basic_info(session, token)
+    )
+    is_superuser = sentence_user_is_superuser or user_is_superuser
+    # 存储处理结果
+    result = {
+        "success_count": 0,
+        "internal_duplicates": [],
+        "db_duplicates": [],
+        "errors": [],
+    }
+    # 已确认存在的分类ID，每批只查询尚未确认的分类
+    known_categories = set()
+    with upload_errors():
+        rows = _iter_import_rows(open_text(file), file_format)
+        items = _parse_import_rows(rows, default_category_id, result)
+        for batch in chunked(items, IMPORT_BATCH_SIZE):
+            _import_sentence_batch(
+                session, batch, sentence_user_id, is_superuser, known_categories, result
+            )
+    return result
+
+
+# 辅助函数：句子归属条件（超级管理员不受限制，普通用户只能操作自己的句子）
+def _ownership_clause(is_superuser: bool, sentence_user_id: uuid.UUID) -> list:
+    if is_superuser:
+        return []
+    return [SentenceContentModel.sentence_user_id == sentence_user_id]
+
+
+# 辅助函数：写操作未命中时区分句子不存在（404）和无权操作（403）
+def _raise_not_found_or_forbidden(session: Session, _id: uuid.UUID):
+    if session.get(SentenceContentModel, _id) is None:
+        raise HTTPException(status_code=404, detail="Sentence not found")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="操作被禁止")
+
+
+# 辅助函数：删除满足条件的句子的点赞记录，避免外键约束阻止删除句子
+def _delete_likes(session: Session, filters: list):
+    target_ids = select(SentenceContentModel.id).where(*filters)
+    session.exec(
+        delete(SentenceLikeModel).where(SentenceLikeModel.sentence_id.in_(target_ids))
+    )
+
+
+# 删除句子方法（归属条件直接写在 DELETE 的 WHERE 中）
 def delete_sentence(session: Session, _id: uuid.UUID, token: str):
-    (
-        sentence_user_is_superuser,
-        user_is_superuser,
-        *_,
-        sentence_user_sentence_content,
-    ) = get_basic_info(session, token)
+    (sentence_user_is_superuser, user_is_superuser, sentence_user_id) = (
+        get_basic_info(session, token)
+    )
+    is_superuser = sentence_user_is_superuser or user_is_superuser
+    filters = [
+        SentenceContentModel.id == _id,
+        *_ownership_clause(is_superuser, sentence_user_id),
+    ]
     try:
-        sentence_db = session.get(SentenceContentModel, _id)
-        if not sentence_db:
-            raise HTTPException(status_code=404, detail="Sentence not found")
-        if (sentence_user_is_superuser or user_is_superuser) or (
-            sentence_db in sentence_user_sentence_content
-        ):
-            session.delete(sentence_db)
-            session.commit()
-            return {"msg": "句子删除成功", "category": sentence_db.model_dump()}
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="操作被禁止")
+        _delete_likes(session, filters)
+        statement = (
+            delete(SentenceContentModel)
+            .where(*filters)
+            .returning(*SentenceContentModel.__table__.columns)
+        )
+        row = session.exec(statement).first()
+        if row is None:
+            session.rollback()
+            _raise_not_found_or_forbidden(session, _id)
+        session.commit()
+        sentence_sampler.discard([_id])
+        sentence_search_index.discard([_id])
+        return {"msg": "句子删除成功", "category": dict(row._mapping)}
     except HTTPException:
         raise
     except Exception as e:
@@ -266,32 +429,37 @@ def delete_sentence(session: Session, _id: uuid.UUID, token: str):
         raise HTTPException(status_code=422, detail="删除句子失败，请联系管理员！")
 
 
-# 更新句子方法
+# 更新句子方法（归属条件直接写在 UPDATE 的 WHERE 中）
 def update_sentence(
     session: Session,
     _id: uuid.UUID,
     sentence_update: SentenceUpdateAndCreate,
     token: str,
 ):
-    (
-        sentence_user_is_superuser,
-        user_is_superuser,
-        *_,
-        sentence_user_sentence_content,
-    ) = get_basic_info(session, token)
+    (sentence_user_is_superuser, user_is_superuser, sentence_user_id) = (
+        get_basic_info(session, token)
+    )
+    is_superuser = sentence_user_is_superuser or user_is_superuser
     try:
-        sentence_db = session.get(SentenceContentModel, _id)
-        if not sentence_db:
-            raise HTTPException(status_code=404, detail="Sentence not found")
-        if (sentence_user_is_superuser or user_is_superuser) or (
-            sentence_db in sentence_user_sentence_content
-        ):
-            sentence_dict = sentence_update.model_dump(exclude_unset=True)
-            sentence_db.sqlmodel_update(sentence_dict)
-            session.commit()
-            session.refresh(sentence_db)
-            return sentence_db
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="操作被禁止")
+        sentence_dict = sentence_update.model_dump(exclude_unset=True)
+        statement = (
+            update(SentenceContentModel)
+            .where(
+                SentenceContentModel.id == _id,
+                *_ownership_clause(is_superuser, sentence_user_id),
+            )
+            .values(**sentence_dict)
+            .returning(*SentenceContentModel.__table__.columns)
+        )
+        row = session.exec(statement).first()
+        if row is None:
+            session.rollback()
+            _raise_not_found_or_forbidden(session, _id)
+        session.commit()
+        sentence_db = SentenceResponse.model_validate(dict(row._mapping))
+        sentence_sampler.upsert(sentence_db)
+        sentence_search_index.upsert(sentence_db)
+        return sentence_db
     except HTTPException:
         raise
     except Exception as e:
@@ -300,21 +468,10 @@ def update_sentence(
         raise HTTPException(status_code=500, detail="更新句子失败，请联系管理员！")
 
 
-# 获取随机句子的方法
+# 获取随机句子的方法（从内存采样池中抽取已启用的句子）
 def get_sentence(session: Session, category_id: str, limit: int):
     try:
-        if category_id == "all":
-            statement = (
-                select(SentenceContentModel).order_by(func.random()).limit(limit)
-            )
-        else:
-            statement = (
-                select(SentenceContentModel)
-                .where(SentenceContentModel.category_id == category_id)
-                .order_by(func.random())
-                .limit(limit)
-            )
-        sentences = session.exec(statement).all()
+        sentences = sentence_sampler.sample(session, category_id, limit)
         return sentences
     except Exception as e:
         session.rollback()
@@ -322,6 +479,79 @@ def get_sentence(session: Session, category_id: str, limit: int):
         raise HTTPException(status_code=500, detail="查询句子失败，请联系管理员！")
 
 
+# 辅助函数：构建句子筛选条件（权限范围、搜索、分类、状态）
+def _build_sentence_filters(
+    session: Session,
+    is_superuser: bool,
+    sentence_user_id: uuid.UUID,
+    search: str = None,
+    category_id: str = None,
+    is_disabled: bool = None,
+    matched_ids: set[uuid.UUID] | None = None,
+):
+    filters = []
+
+    # 普通用户只能查看自己的句子
+    filters.extend(_ownership_clause(is_superuser, sentence_user_id))
+
+    # 添加搜索条件（优先使用内存倒排索引，关键词含通配符时回退到 ILIKE）
+    if search:
+        if matched_ids is None:
+            matched_ids = sentence_search_index.search(session, search)
+        if matched_ids is None:
+            filters.append(SentenceContentModel.content.ilike(f"%{search}%"))
+        else:
+            filters.append(any_of(SentenceContentModel.id, matched_ids))
+
+    # 添加分类过滤
+    if category_id and category_id != "all":
+        filters.append(SentenceContentModel.category_id == category_id)
+
+    # 添加状态过滤
+    if is_disabled is not None:
+        filters.append(SentenceContentModel.is_disabled == is_disabled)
+
+    return filters
+
+
+# 辅助函数：搜索命中的句子超过阈值时，在内存中完成筛选、计数和排序，只查询当前页的句子，
+# 避免把大量ID作为ANY数组交给数据库；返回(当前页句子, 总数, 命中ID)，
+# 未使用内存分页时前两项为None，命中ID可传给_build_sentence_filters复用
+def _search_page_in_memory(
+    session: Session,
+    is_superuser: bool,
+    sentence_user_id: uuid.UUID,
+    search: str,
+    category_id: str | None,
+    is_disabled: bool | None,
+    limit: int,
+    offset: int = 0,
+    before: tuple | None = None,
+):
+    if not search:
+        return None, None, None
+    matched_ids = sentence_search_index.search(session, search)
+    if matched_ids is None or len(matched_ids) <= fastapi_config.SENTENCE_SEARCH_ID_LIMIT:
+        return None, None, matched_ids
+    keys, total = sentence_search_index.top_matches(
+        matched_ids,
+        offset + limit,
+        sentence_user_id=None if is_superuser else sentence_user_id,
+        category_id=category_id if category_id and category_id != "all" else None,
+        is_disabled=is_disabled,
+        before=before,
+    )
+    page_ids = [_id for _, _id in keys[offset:]]
+    statement = (
+        select(SentenceContentModel)
+        .where(any_of(SentenceContentModel.id, page_ids))
+        .order_by(
+            SentenceContentModel.created_at.desc(), SentenceContentModel.id.desc()
+        )
+    )
+    return session.exec(statement).all(), total, matched_ids
+
+
 # 分页查询句子的方法（支持筛选）
 def get_sentence_paginated(
     session: Session,
@@ -338,44 +568,46 @@ def get_sentence_paginated(
             get_basic_info(session, token)
         )
 
-        # 构建查询语句
-        if sentence_user_is_superuser or user_is_superuser:
-            # 超级管理员可以查看所有句子
-            statement = select(SentenceContentModel)
-        else:
-            # 普通用户只能查看自己的句子
-            statement = select(SentenceContentModel).where(
-                SentenceContentModel.sentence_user_id == sentence_user_id
-            )
+        is_superuser = sentence_user_is_superuser or user_is_superuser
+        offset = (page - 1) * page_size
 
-        # 添加搜索条件
-        if search:
-            statement = statement.where(
-                SentenceContentModel.content.ilike(f"%{search}%")
+        # 搜索命中较多时直接在内存中计数和分页
+        sentences, total, matched_ids = _search_page_in_memory(
+            session,
+            is_superuser,
+            sentence_user_id,
+            search,
+            category_id,
+            is_disabled,
+            page_size,
+            offset=offset,
+        )
+        if sentences is None:
+            # 构建查询语句
+            filters = _build_sentence_filters(
+                session,
+                is_superuser,
+                sentence_user_id,
+                search,
+                category_id,
+                is_disabled,
+                matched_ids,
             )
+            statement = select(SentenceContentModel).where(*filters)
 
-        # 添加分类过滤
-        if category_id and category_id != "all":
-            statement = statement.where(SentenceContentModel.category_id == category_id)
-
-        # 添加状态过滤
-        if is_disabled is not None:
-            statement = statement.where(SentenceContentModel.is_disabled == is_disabled)
+            # 计算总条数
+            total_statement = select(func.count()).select_from(statement.subquery())
+            total = session.exec(total_statement).one()
 
-        # 计算总条数
-        total_statement = select(func.count()).select_from(statement.subquery())
-        total = session.exec(total_statement).one()
-
-        # 计算偏移量并添加排序
-        offset = (page - 1) * page_size
-        statement = (
-            statement.order_by(SentenceContentModel.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
+            # 添加排序和偏移量
+            statement = (
+                statement.order_by(SentenceContentModel.created_at.desc())
+                .offset(offset)
+                .limit(page_size)
+            )
 
-        # 执行查询
-        sentences = session.exec(statement).all()
+            # 执行查询
+            sentences = session.exec(statement).all()
 
         # 计算总页数
         total_pages = (total + page_size - 1) // page_size
@@ -388,52 +620,167 @@ def get_sentence_paginated(
             "total_pages": total_pages,
             "items": sentences,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         session.rollback()
         print(f"分页查询句子失败：{str(e)}")
         raise HTTPException(status_code=500, detail="分页查询句子失败，请联系管理员！")
 
 
-# 辅助函数：获取批量句子（根据权限过滤）
-def _get_batch_sentences(session: Session, ids: list[uuid.UUID], token: str):
-    """获取批量句子，根据用户权限进行过滤"""
-    (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
-        get_basic_info(session, token)
+# 辅助函数：由多取一条的查询结果生成游标分页响应
+def _cursor_page_result(sentences: list, page_size: int, total: int | None) -> dict:
+    has_more = len(sentences) > page_size
+    sentences = sentences[:page_size]
+    next_cursor = (
+        encode_cursor(sentences[-1].created_at, sentences[-1].id)
+        if has_more
+        else None
     )
+    return {
+        "total": total,
+        "page_size": page_size,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "items": sentences,
+    }
 
-    # 构建查询语句
-    if sentence_user_is_superuser or user_is_superuser:
-        # 超级管理员可以操作所有句子
-        statement = select(SentenceContentModel).where(SentenceContentModel.id.in_(ids))
-    else:
-        # 普通用户只能操作自己的句子
-        statement = select(SentenceContentModel).where(
-            SentenceContentModel.id.in_(ids),
-            SentenceContentModel.sentence_user_id == sentence_user_id,
+
+# 游标分页查询句子的方法：按(created_at, id)定位下一页，每页耗时与页码无关
+def get_sentence_cursor_page(
+    session: Session,
+    page_size: int,
+    token: str,
+    cursor: str = None,
+    with_total: bool = False,
+    search: str = None,
+    category_id: str = None,
+    is_disabled: bool = None,
+):
+    # 先解析游标，格式错误直接返回400
+    position = decode_cursor(cursor) if cursor else None
+    try:
+        # 获取用户权限信息
+        (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
+            get_basic_info(session, token)
         )
+        is_superuser = sentence_user_is_superuser or user_is_superuser
+
+        # 搜索命中较多时直接在内存中计数和按游标分页，多取一条判断是否还有下一页
+        sentences, total, matched_ids = _search_page_in_memory(
+            session,
+            is_superuser,
+            sentence_user_id,
+            search,
+            category_id,
+            is_disabled,
+            page_size + 1,
+            before=position,
+        )
+        if sentences is not None:
+            return _cursor_page_result(
+                sentences, page_size, total if with_total else None
+            )
 
-    # 执行查询
-    sentences = session.exec(statement).all()
+        filters = _build_sentence_filters(
+            session,
+            is_superuser,
+            sentence_user_id,
+            search,
+            category_id,
+            is_disabled,
+            matched_ids,
+        )
+
+        # 总条数可选，并按筛选条件短时缓存（近似值）
+        total = None
+        if with_total:
+            count_key = (
+                "all" if is_superuser else str(sentence_user_id),
+                search,
+                category_id,
+                is_disabled,
+            )
+            total = sentence_count_cache.get(count_key)
+            if total is None:
+                total = session.exec(
+                    select(func.count(SentenceContentModel.id)).where(*filters)
+                ).one()
+                sentence_count_cache.set(count_key, total)
+
+        # 从游标位置向后查找，多取一条判断是否还有下一页
+        statement = select(SentenceContentModel).where(*filters)
+        if position:
+            statement = statement.where(
+                tuple_(SentenceContentModel.created_at, SentenceContentModel.id)
+                < tuple_(*position)
+            )
+        statement = statement.order_by(
+            SentenceContentModel.created_at.desc(), SentenceContentModel.id.desc()
+        ).limit(page_size + 1)
+        sentences = session.exec(statement).all()
+        return _cursor_page_result(sentences, page_size, total)
+    except HTTPException:
+        raise
+    except Exception as e:
+        session.rollback()
+        print(f"游标分页查询句子失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="分页查询句子失败，请联系管理员！")
+
+
+# 辅助函数：按条件批量更新句子状态（单条 UPDATE ... RETURNING），返回更新后的句子
+def _bulk_update_status(
+    session: Session, filters: list, is_disabled: bool
+) -> list[SentenceResponse]:
+    statement = (
+        update(SentenceContentModel)
+        .where(*filters)
+        .values(is_disabled=is_disabled)
+        .returning(*SentenceContentModel.__table__.columns)
+    )
+    return [
+        SentenceResponse.model_validate(dict(row._mapping))
+        for row in session.exec(statement).all()
+    ]
+
+
+# 辅助函数：按条件批量删除句子及其点赞记录，返回被删除的句子ID
+def _bulk_delete(session: Session, filters: list) -> list[uuid.UUID]:
+    _delete_likes(session, filters)
+    statement = (
+        delete(SentenceContentModel)
+        .where(*filters)
+        .returning(SentenceContentModel.id)
+    )
+    return list(session.exec(statement).scalars().all())
 
-    if not sentences:
-        raise HTTPException(status_code=404, detail="未找到可操作的句子")
 
-    return sentences
+# 辅助函数：构建批量操作的条件（指定ID且在用户权限范围内）
+def _batch_filters(session: Session, ids: list[uuid.UUID], token: str) -> list:
+    (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
+        get_basic_info(session, token)
+    )
+    is_superuser = sentence_user_is_superuser or user_is_superuser
+    return [
+        any_of(SentenceContentModel.id, ids),
+        *_ownership_clause(is_superuser, sentence_user_id),
+    ]
 
 
 # 批量更改句子状态的方法
 def batch_update_sentence_status(
     session: Session, ids: list[uuid.UUID], is_disabled: bool, token: str
 ):
+    filters = _batch_filters(session, ids, token)
     try:
-        # 获取可操作的句子
-        sentences = _get_batch_sentences(session, ids, token)
-
-        # 批量更新状态
-        for sentence in sentences:
-            sentence.is_disabled = is_disabled
+        sentences = _bulk_update_status(session, filters, is_disabled)
+        if not sentences:
+            session.rollback()
+            raise HTTPException(status_code=404, detail="未找到可操作的句子")
 
         session.commit()
+        sentence_sampler.upsert_many(sentences)
+        sentence_search_index.upsert_many(sentences)
 
         return {"msg": "批量更新句子状态成功", "updated_count": len(sentences)}
     except HTTPException:
@@ -448,17 +795,18 @@ def batch_update_sentence_status(
 
 # 批量删除句子的方法
 def batch_delete_sentences(session: Session, ids: list[uuid.UUID], token: str):
+    filters = _batch_filters(session, ids, token)
     try:
-        # 获取可操作的句子
-        sentences = _get_batch_sentences(session, ids, token)
-
-        # 批量删除
-        for sentence in sentences:
-            session.delete(sentence)
+        deleted_ids = _bulk_delete(session, filters)
+        if not deleted_ids:
+            session.rollback()
+            raise HTTPException(status_code=404, detail="未找到可操作的句子")
 
         session.commit()
+        sentence_sampler.discard(deleted_ids)
+        sentence_search_index.discard(deleted_ids)
 
-        return {"msg": "批量删除句子成功", "deleted_count": len(sentences)}
+        return {"msg": "批量删除句子成功", "deleted_count": len(deleted_ids)}
     except HTTPException:
         raise
     except Exception as e:
@@ -467,26 +815,127 @@ def batch_delete_sentences(session: Session, ids: list[uuid.UUID], token: str):
         raise HTTPException(status_code=500, detail="批量删除句子失败，请联系管理员！")
 
 
-# 获取应用统计信息的方法
+# 辅助函数：构建按筛选条件批量操作的条件，未指定任何筛选条件时拒绝执行
+def _bulk_filter_conditions(
+    session: Session,
+    token: str,
+    search: str = None,
+    category_id: str = None,
+    is_disabled: bool = None,
+) -> list:
+    if not search and (not category_id or category_id == "all") and is_disabled is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请至少指定一个筛选条件（search、category_id或is_disabled）",
+        )
+    (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
+        get_basic_info(session, token)
+    )
+    is_superuser = sentence_user_is_superuser or user_is_superuser
+    return _build_sentence_filters(
+        session, is_superuser, sentence_user_id, search, category_id, is_disabled
+    )
+
+
+# 辅助函数：统计满足条件的句子数量（预览模式使用）
+def _count_sentences(session: Session, filters: list) -> int:
+    statement = select(func.count(SentenceContentModel.id)).where(*filters)
+    return session.exec(statement).one()
+
+
+# 按筛选条件批量更改句子状态的方法（条件与分页查询一致，支持仅统计数量的预览模式）
+def bulk_update_sentence_status_by_filter(
+    session: Session,
+    set_disabled: bool,
+    token: str,
+    search: str = None,
+    category_id: str = None,
+    is_disabled: bool = None,
+    dry_run: bool = False,
+):
+    filters = _bulk_filter_conditions(session, token, search, category_id, is_disabled)
+    # 跳过状态已经是目标状态的句子
+    filters.append(SentenceContentModel.is_disabled != set_disabled)
+    try:
+        if dry_run:
+            return {"dry_run": True, "matched_count": _count_sentences(session, filters)}
+        sentences = _bulk_update_status(session, filters, set_disabled)
+        session.commit()
+        sentence_sampler.upsert_many(sentences)
+        sentence_search_index.upsert_many(sentences)
+        return {"msg": "批量更新句子状态成功", "updated_count": len(sentences)}
+    except Exception as e:
+        session.rollback()
+        print(f"按条件批量更新句子状态失败：{str(e)}")
+        raise HTTPException(
+            status_code=500, detail="批量更新句子状态失败，请联系管理员！"
+        )
+
+
+# 按筛选条件批量删除句子的方法（条件与分页查询一致，支持仅统计数量的预览模式）
+def bulk_delete_sentences_by_filter(
+    session: Session,
+    token: str,
+    search: str = None,
+    category_id: str = None,
+    is_disabled: bool = None,
+    dry_run: bool = False,
+):
+    filters = _bulk_filter_conditions(session, token, search, category_id, is_disabled)
+    try:
+        if dry_run:
+            return {"dry_run": True, "matched_count": _count_sentences(session, filters)}
+        deleted_ids = _bulk_delete(session, filters)
+        session.commit()
+        sentence_sampler.discard(deleted_ids)
+        sentence_search_index.discard(deleted_ids)
+        return {"msg": "批量删除句子成功", "deleted_count": len(deleted_ids)}
+    except Exception as e:
+        session.rollback()
+        print(f"按条件批量删除句子失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="批量删除句子失败，请联系管理员！")
+
+
+# 获取应用统计信息的方法（单条分组聚合查询，结果按用户范围短时缓存）
 def get_sentence_stats(session: Session, token: str):
     try:
         # 获取用户权限信息
         (sentence_user_is_superuser, user_is_superuser, sentence_user_id, *_) = (
             get_basic_info(session, token)
         )
-
-        # 构建基础查询语句
-        if sentence_user_is_superuser or user_is_superuser:
-            # 超级管理员可以查看所有句子
-            base_statement = select(SentenceContentModel)
-        else:
-            # 普通用户只能查看自己的句子
-            base_statement = select(SentenceContentModel).where(
-                SentenceContentModel.sentence_user_id == sentence_user_id
+        is_superuser = sentence_user_is_superuser or user_is_superuser
+
+        # 超级管理员共享同一份统计，普通用户按自身范围缓存
+        cache_key = "all" if is_superuser else str(sentence_user_id)
+        cached_stats = sentence_stats_cache.get(cache_key)
+        if cached_stats is not None:
+            return cached_stats
+
+        # 构建关联条件：普通用户只统计自己的句子
+        join_condition = SentenceContentModel.category_id == SentenceCategoryModel.id
+        if not is_superuser:
+            join_condition = and_(
+                join_condition,
+                SentenceContentModel.sentence_user_id == sentence_user_id,
             )
 
-        # 获取所有分类
-        categories = session.exec(select(SentenceCategoryModel)).all()
+        # 按分类分组，一次查询统计总数、启用数和禁用数
+        statement = (
+            select(
+                SentenceCategoryModel.id,
+                SentenceCategoryModel.category,
+                func.count(SentenceContentModel.id),
+                func.count(SentenceContentModel.id).filter(
+                    SentenceContentModel.is_disabled == False  # noqa: E712
+                ),
+                func.count(SentenceContentModel.id).filter(
+                    SentenceContentModel.is_disabled == True  # noqa: E712
+                ),
+            )
+            .select_from(SentenceCategoryModel)
+            .outerjoin(SentenceContentModel, join_condition)
+            .group_by(SentenceCategoryModel.id, SentenceCategoryModel.category)
+        )
 
         # 统计信息
         stats = {
@@ -496,37 +945,24 @@ def get_sentence_stats(session: Session, token: str):
             "categories": [],
         }
 
-        # 统计每个分类的信息
-        for category in categories:
-            # 构建分类查询语句
-            category_statement = base_statement.where(
-                SentenceContentModel.category_id == category.id
-            )
-
-            # 获取分类下的所有句子
-            category_sentences = session.exec(category_statement).all()
-            category_total = len(category_sentences)
-
-            # 统计启用和禁用数量
-            category_enabled = sum(1 for s in category_sentences if not s.is_disabled)
-            category_disabled = sum(1 for s in category_sentences if s.is_disabled)
-
-            # 添加到统计信息
+        # 汇总每个分类的信息
+        for category_id, name, total, enabled, disabled in session.exec(statement).all():
             stats["categories"].append(
                 {
-                    "id": category.id,
-                    "name": category.category,
-                    "total": category_total,
-                    "enabled": category_enabled,
-                    "disabled": category_disabled,
+                    "id": category_id,
+                    "name": name,
+                    "total": total,
+                    "enabled": enabled,
+                    "disabled": disabled,
                 }
             )
 
             # 更新总统计
-            stats["total_sentences"] += category_total
-            stats["enabled_sentences"] += category_enabled
-            stats["disabled_sentences"] += category_disabled
+            stats["total_sentences"] += total
+            stats["enabled_sentences"] += enabled
+            stats["disabled_sentences"] += disabled
 
+        sentence_stats_cache.set(cache_key, stats)
         return stats
     except Exception as e:
         session.rollback()
@@ -534,43 +970,58 @@ def get_sentence_stats(session: Session, token: str):
         raise HTTPException(status_code=500, detail="获取统计信息失败，请联系管理员！")
 
 
-# 点赞方法
+# 查询该IP今天是否已对句子点过赞（数据库中的记录）
+def _has_today_like(session: Session, sentence_id: uuid.UUID, ip_address: str):
+    existing_like = session.exec(
+        select(SentenceLikeModel.id).where(
+            SentenceLikeModel.sentence_id == sentence_id,
+            SentenceLikeModel.ip_address == ip_address,
+            SentenceLikeModel.created_at >= today_start(),
+        )
+    ).first()
+    return existing_like is not None
+
+
+# 判断该IP今天是否已对句子点过赞（优先使用内存去重索引）
+def _is_liked_today(session: Session, sentence_id: uuid.UUID, ip_address: str):
+    liked = like_dedup_index.contains(sentence_id, ip_address)
+    if liked is not None:
+        return liked
+    # 索引未命中且需要确认时回退到数据库，同时考虑尚未落库的缓冲数据
+    if like_buffer.has_pending_like(sentence_id, ip_address):
+        return True
+    if like_buffer.has_pending_unlike(sentence_id, ip_address):
+        return False
+    return _has_today_like(session, sentence_id, ip_address)
+
+
+# 点赞方法（点赞先写入内存缓冲，由后台任务批量落库）
 def like_sentence(session: Session, sentence_id: uuid.UUID, ip_address: str):
     try:
-        # 检查句子是否存在
-        sentence = session.get(SentenceContentModel, sentence_id)
-        if not sentence:
-            raise HTTPException(status_code=404, detail="句子不存在")
-
-        # 检查句子是否启用
-        if sentence.is_disabled:
-            raise HTTPException(status_code=403, detail="句子已禁用，无法点赞")
-
-        # 获取今天的开始时间
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # 检查该IP今天是否已经对该句子点过赞
-        existing_like = session.exec(
-            select(SentenceLikeModel).where(
-                SentenceLikeModel.sentence_id == sentence_id,
-                SentenceLikeModel.ip_address == ip_address,
-                SentenceLikeModel.created_at >= today,
-            )
-        ).first()
-
-        if existing_like:
+        # 优先从采样池中检查句子是否存在且已启用
+        sentence = sentence_sampler.get(session, sentence_id)
+        if sentence is None:
+            sentence = session.get(SentenceContentModel, sentence_id)
+            if not sentence:
+                raise HTTPException(status_code=404, detail="句子不存在")
+            # 检查句子是否启用
+            if sentence.is_disabled:
+                raise HTTPException(status_code=403, detail="句子已禁用，无法点赞")
+
+        # 检查该IP今天是否已经对该句子点过赞（包括尚未落库的点赞）
+        if _is_liked_today(session, sentence_id, ip_address):
             raise HTTPException(status_code=400, detail="今天已经对该句子点过赞了")
 
-        # 创建点赞记录
-        like = SentenceLikeModel(sentence_id=sentence_id, ip_address=ip_address)
-        session.add(like)
-
-        # 增加句子的点赞数
-        sentence.likes += 1
+        # 写入点赞缓冲，检查与写入在同一把锁内完成，并发的重复点赞在这里被拒绝
+        if not like_buffer.add_like(sentence_id, ip_address):
+            raise HTTPException(status_code=400, detail="今天已经对该句子点过赞了")
+        like_dedup_index.add(sentence_id, ip_address)
 
-        session.commit()
+        likes = sentence_sampler.adjust_likes(sentence_id, 1)
+        if likes is None:
+            likes = sentence.likes + like_buffer.pending_delta(sentence_id)
 
-        return {"msg": "点赞成功", "likes": sentence.likes}
+        return {"msg": "点赞成功", "likes": likes}
     except HTTPException:
         raise
     except Exception as e:
@@ -583,35 +1034,26 @@ def like_sentence(session: Session, sentence_id: uuid.UUID, ip_address: str):
 def unlike_sentence(session: Session, sentence_id: uuid.UUID, ip_address: str):
     try:
         # 检查句子是否存在
-        sentence = session.get(SentenceContentModel, sentence_id)
-        if not sentence:
-            raise HTTPException(status_code=404, detail="句子不存在")
-
-        # 获取今天的开始时间
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # 查找该IP今天对该句子的点赞记录
-        existing_like = session.exec(
-            select(SentenceLikeModel).where(
-                SentenceLikeModel.sentence_id == sentence_id,
-                SentenceLikeModel.ip_address == ip_address,
-                SentenceLikeModel.created_at >= today,
-            )
-        ).first()
-
-        if not existing_like:
+        sentence = sentence_sampler.get(session, sentence_id)
+        if sentence is None:
+            sentence = session.get(SentenceContentModel, sentence_id)
+            if not sentence:
+                raise HTTPException(status_code=404, detail="句子不存在")
+
+        # 查找该IP今天对该句子的点赞记录（包括尚未落库的点赞）
+        if not _is_liked_today(session, sentence_id, ip_address):
             raise HTTPException(status_code=400, detail="今天没有对该句子点过赞")
 
-        # 删除点赞记录
-        session.delete(existing_like)
-
-        # 减少句子的点赞数
-        if sentence.likes > 0:
-            sentence.likes -= 1
+        # 写入取消点赞缓冲，并发的重复取消在这里被拒绝
+        if not like_buffer.remove_like(sentence_id, ip_address):
+            raise HTTPException(status_code=400, detail="今天没有对该句子点过赞")
+        like_dedup_index.remove(sentence_id, ip_address)
 
-        session.commit()
+        likes = sentence_sampler.adjust_likes(sentence_id, -1)
+        if likes is None:
+            likes = max(sentence.likes + like_buffer.pending_delta(sentence_id), 0)
 
-        return {"msg": "取消点赞成功", "likes": sentence.likes}
+        return {"msg": "取消点赞成功", "likes": likes}
     except HTTPException:
         raise
     except Exception as e:
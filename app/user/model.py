@@ -1,8 +1,10 @@
 import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, EmailStr
-from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Column, DateTime
+from sqlmodel import SQLModel, Field, Relationship, func
 
 if TYPE_CHECKING:
     from app.sentence.model import SentenceUserConfigModel
@@ -37,6 +39,11 @@ class UserModel(SQLModel, table=True):
         description="超级管理员标识，True表示拥有系统最高权限",
         default=False,
     )
+    token_version: int = Field(
+        description="令牌版本号，递增后该用户已签发的携带权限信息的令牌全部失效",
+        default=0,
+        sa_column_kwargs={"server_default": "0"},
+    )
     sentence_user_config: "SentenceUserConfigModel" = Relationship(
         back_populates="user",
         cascade_delete=True,
@@ -47,15 +54,52 @@ class UserModel(SQLModel, table=True):
     )
 
 
+# 刷新令牌表模型（只保存令牌的SHA-256摘要，不保存明文）
+class RefreshTokenModel(SQLModel, table=True):
+    __tablename__ = "refresh_token"
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid7,
+        primary_key=True,
+        index=True,
+        unique=True,
+    )
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE", index=True)
+    token_hash: str = Field(
+        description="刷新令牌的SHA-256摘要",
+        unique=True,
+        index=True,
+        max_length=64,
+    )
+    expires_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
+    created_at: datetime = Field(sa_column=Column(DateTime, default=func.now()))
+
+
 class Token(BaseModel):
     access_token: str = Field(description="JWT访问令牌")
     token_type: str = Field(description="令牌类型，通常为bearer")
+    refresh_token: str | None = Field(
+        description="刷新令牌，用于换取新的访问令牌", default=None
+    )
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(description="登录时获得的刷新令牌")
 
 
 class TokenData(BaseModel):
     id: str | None = Field(description="用户ID", default=None)
 
 
+# 用户权限上下文：一次查询得到的鉴权所需信息，不包含任何关联集合
+class AuthContext(BaseModel):
+    user_id: uuid.UUID = Field(description="用户ID")
+    is_superuser: bool = Field(description="是否为系统超级管理员")
+    sentence_is_superuser: bool = Field(description="是否为句子应用超级管理员")
+    sentence_user_id: uuid.UUID | None = Field(description="句子应用用户ID")
+    school_ids: frozenset[uuid.UUID] = Field(description="分管的学校ID集合")
+
+
 class UserResponse(SQLModel):
     id: uuid.UUID = Field(description="用户唯一标识符")
     email: EmailStr = Field(description="用户邮箱地址")
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Body, status, Depends, HTTPException
-from datetime import timedelta
+from fastapi import APIRouter, Body, status, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.user.model import UserResponse, UserCreateAndUpdate, Token
+from app.user.model import (
+    UserResponse,
+    UserCreateAndUpdate,
+    Token,
+    RefreshTokenRequest,
+)
 from app.user.server import (
     create_user,
     authenticate_user,
-    create_access_token,
+    check_login_throttle,
+    issue_access_token,
+    create_refresh_token,
+    refresh_access_token,
     get_current_user,
 )
 from app.core.database import SessionDep
 from typing import Annotated
-from app.config import fastapi_config
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/token")
 
-ACCESS_TOKEN_EXPIRE_MINUTES = fastapi_config.ACCESS_TOKEN_EXPIRE_MINUTES
 auth_router = APIRouter()
 
 
@@ -130,13 +136,25 @@ def get_users_me_route(
                 }
             },
         },
+        429: {
+            "description": "登录尝试过于频繁（按IP和邮箱限流）",
+            "content": {
+                "application/json": {"example": {"detail": "登录尝试过于频繁，请稍后再试"}}
+            },
+        },
     },
 )
 async def login_for_access_token(
     session: SessionDep,
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ):
-    user = authenticate_user(session, form_data.username, form_data.password)
+    # 超出频率限制的请求在查询用户和校验密码之前直接拒绝
+    client_ip = request.client.host if request.client else None
+    check_login_throttle(client_ip, form_data.username)
+    user = await authenticate_user(
+        session, form_data.username, form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -149,8 +167,26 @@ async def login_for_access_token(
             detail="当前用户未激活",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+    access_token = await run_in_threadpool(issue_access_token, session, user)
+    refresh_token = await run_in_threadpool(create_refresh_token, session, user.id)
+    return Token(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
     )
-    return Token(access_token=access_token, token_type="bearer")
+
+
+@auth_router.post(
+    "/token/refresh",
+    summary="刷新访问令牌",
+    description="使用登录时获得的刷新令牌换取新的访问令牌和刷新令牌，旧的刷新令牌随即失效，无需再次提交密码。",
+    response_model=Token,
+    responses={
+        401: {
+            "description": "刷新令牌无效或已过期",
+            "content": {
+                "application/json": {"example": {"detail": "刷新令牌无效或已过期"}}
+            },
+        },
+    },
+)
+def refresh_access_token_route(session: SessionDep, request: RefreshTokenRequest):
+    return refresh_access_token(session, request.refresh_token)
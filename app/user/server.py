@@ -1,41 +1,125 @@
+import functools
+import hashlib
+import secrets
+import time
+import uuid
+
 import jwt
 from fastapi import HTTPException, status
 from jwt import InvalidTokenError
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update, delete, and_
 from pwdlib import PasswordHash
-from app.user.model import UserCreateAndUpdate, UserModel, TokenData
+from app.user.model import (
+    UserCreateAndUpdate,
+    UserModel,
+    TokenData,
+    AuthContext,
+    RefreshTokenModel,
+    Token,
+)
 from app.sentence.model import SentenceUserConfigModel
+from app.school.model import SchoolAdminModel
 from datetime import datetime, timedelta, timezone
 from app.config import fastapi_config
+from app.core.cache import TTLCache
+from app.core.executor import BoundedExecutor
+from app.core.metrics import register_metrics
+from app.core.ratelimit import TokenBucketLimiter
+from starlette.concurrency import run_in_threadpool
 
 password_hash = PasswordHash.recommended()
 
-# 一个假的哈希值
-DUMMY_HASH = password_hash.hash("DUMMY_HASH_vnVoKIj501AlSSBhmH4SZA752RAi4N7VF4")
+# 密码哈希线程池：Argon2计算不在事件循环和请求线程池中执行，排队过多时快速失败
+password_hash_executor = BoundedExecutor(
+    "password-hash",
+    max_workers=fastapi_config.PASSWORD_HASH_WORKERS,
+    max_pending=fastapi_config.PASSWORD_HASH_MAX_PENDING,
+)
+register_metrics("password_hash_pool", password_hash_executor.stats)
+
+# 登录限流：分别按IP和邮箱限制尝试频率，在密码校验之前拒绝超额请求
+login_ip_limiter = TokenBucketLimiter(
+    capacity=fastapi_config.LOGIN_IP_BURST,
+    refill_per_second=fastapi_config.LOGIN_IP_PER_MINUTE / 60,
+    maxsize=100_000,
+)
+login_email_limiter = TokenBucketLimiter(
+    capacity=fastapi_config.LOGIN_EMAIL_BURST,
+    refill_per_second=fastapi_config.LOGIN_EMAIL_PER_MINUTE / 60,
+    maxsize=100_000,
+)
+register_metrics("login_ip_limiter", login_ip_limiter.stats)
+register_metrics("login_email_limiter", login_email_limiter.stats)
+
+# 一个假的哈希值（用户不存在时也执行一次校验，避免通过耗时判断邮箱是否注册）
+# 首次使用时才计算，不占用导入和启动时间
+@functools.cache
+def get_dummy_hash() -> str:
+    return password_hash.hash("DUMMY_HASH_vnVoKIj501AlSSBhmH4SZA752RAi4N7VF4")
+
+
+# 校验密码，哈希值为空时与假哈希值比较
+def _verify_or_dummy(plain_password: str, hashed_password: str | None) -> bool:
+    return password_hash.verify(plain_password, hashed_password or get_dummy_hash())
 
 # 获取环境变量的JWT配置
 SECRET_KEY = fastapi_config.JWT_SECRET_KEY
 ALGORITHM = fastapi_config.ALGORITHM
 
+# 用户权限上下文缓存：键为token的SHA-256摘要，权限变更时清空
+auth_context_cache = TTLCache(
+    maxsize=4096, ttl=fastapi_config.AUTH_CONTEXT_CACHE_SECONDS
+)
+
+# 已验证token缓存：键为token的SHA-256摘要，缓存解码结果直到token过期
+decoded_token_cache = TTLCache(
+    maxsize=fastapi_config.DECODED_TOKEN_CACHE_SIZE,
+    ttl=fastapi_config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+register_metrics("decoded_token_cache", decoded_token_cache.stats)
+register_metrics("auth_context_cache", auth_context_cache.stats)
+
+# 用户token版本号缓存：键为用户ID，用于快速校验携带权限信息的token是否已被吊销
+token_version_cache = TTLCache(
+    maxsize=4096, ttl=fastapi_config.TOKEN_VERSION_CACHE_SECONDS
+)
+
 
 # 密码验证方法
 def verify_password(plain_password, hashed_password):
-    return password_hash.verify(plain_password, hashed_password)
+    return password_hash_executor.run(
+        password_hash.verify, plain_password, hashed_password
+    )
 
 
 # 密码哈希方法
 def get_password_hash(password):
-    return password_hash.hash(password)
+    return password_hash_executor.run(password_hash.hash, password)
+
+
+# 登录限流检查：IP或邮箱的尝试次数超出限制时返回429
+def check_login_throttle(ip_address: str | None, email: str):
+    allowed, retry_after = login_ip_limiter.acquire(ip_address)
+    if allowed:
+        allowed, retry_after = login_email_limiter.acquire(email.strip().lower())
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="登录尝试过于频繁，请稍后再试",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
 
 
 # 用户账号密码登录认证方法(通过验证返回用户信息)
-def authenticate_user(session: Session, email: str, password: str):
+# 查询在请求线程池中执行，密码校验在哈希线程池中执行，不阻塞事件循环
+async def authenticate_user(session: Session, email: str, password: str):
     statement = select(UserModel).where(UserModel.email == email)
-    user = session.exec(statement).first()
-    if not user:
-        verify_password(password, DUMMY_HASH)
-        return False
-    if not verify_password(password, user.hashed_password):
+    user = await run_in_threadpool(lambda: session.exec(statement).first())
+    hashed_password = user.hashed_password if user else None
+    verified = await password_hash_executor.run_async(
+        _verify_or_dummy, password, hashed_password
+    )
+    if not user or not verified:
         return False
     return user
 
@@ -52,6 +136,11 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
+# 计算token的SHA-256摘要，作为进程内缓存的键，缓存中不保存原始token
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 # 解密token方法
 def decode_token(token: str):
     credentials_exception = HTTPException(
@@ -59,10 +148,18 @@ def decode_token(token: str):
         detail="无法验证凭证",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    digest = _token_digest(token)
+    payload = decoded_token_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except InvalidTokenError:
         raise credentials_exception
+    # 只缓存到token过期为止，过期后重新解码时由jwt抛出过期异常
+    ttl = payload["exp"] - time.time() if payload.get("exp") else None
+    decoded_token_cache.set(digest, payload, ttl)
+    return dict(payload)
 
 
 # 创建用户方法
@@ -110,3 +207,200 @@ def get_current_user(session: Session, token: str):
     token_data = TokenData(id=user_id)
     user = get_user(session, user_id=token_data.id)
     return user
+
+
+# 一次外连接查询加载用户的权限上下文（用户不存在时返回None）
+def load_auth_context(session: Session, user_id: uuid.UUID) -> AuthContext | None:
+    statement = (
+        select(
+            UserModel.is_superuser,
+            SentenceUserConfigModel.id,
+            SentenceUserConfigModel.is_superuser,
+            SchoolAdminModel.school_id,
+        )
+        .outerjoin(
+            SentenceUserConfigModel, SentenceUserConfigModel.user_id == UserModel.id
+        )
+        .outerjoin(
+            SchoolAdminModel,
+            and_(
+                SchoolAdminModel.user_id == UserModel.id,
+                SchoolAdminModel.is_active == True,  # noqa: E712
+            ),
+        )
+        .where(UserModel.id == user_id)
+    )
+    rows = session.exec(statement).all()
+    if not rows:
+        return None
+    is_superuser, sentence_user_id, sentence_is_superuser, _ = rows[0]
+    return AuthContext(
+        user_id=user_id,
+        is_superuser=is_superuser,
+        sentence_is_superuser=bool(sentence_is_superuser),
+        sentence_user_id=sentence_user_id,
+        school_ids=frozenset(row[3] for row in rows if row[3] is not None),
+    )
+
+
+# 权限上下文写入token的声明（字段名保持简短以控制token长度）
+def _claims_from_context(context: AuthContext) -> dict:
+    return {
+        "su": context.is_superuser,
+        "ssu": context.sentence_is_superuser,
+        "suid": str(context.sentence_user_id) if context.sentence_user_id else None,
+        "sch": [str(school_id) for school_id in context.school_ids],
+    }
+
+
+# 从token声明还原权限上下文
+def _context_from_claims(user_id: uuid.UUID, payload: dict) -> AuthContext:
+    return AuthContext(
+        user_id=user_id,
+        is_superuser=payload.get("su", False),
+        sentence_is_superuser=payload.get("ssu", False),
+        sentence_user_id=payload.get("suid"),
+        school_ids=frozenset(uuid.UUID(school_id) for school_id in payload.get("sch", [])),
+    )
+
+
+# 签发登录token，开启JWT_EMBED_CLAIMS时token携带权限信息和版本号，有效期较短
+def issue_access_token(session: Session, user: UserModel) -> str:
+    if not fastapi_config.JWT_EMBED_CLAIMS:
+        return create_access_token(
+            data={"sub": str(user.id)},
+            expires_delta=timedelta(minutes=fastapi_config.ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+    context = load_auth_context(session, user.id)
+    data = {"sub": str(user.id), "ver": user.token_version}
+    data.update(_claims_from_context(context))
+    expire_minutes = min(
+        fastapi_config.ACCESS_TOKEN_EXPIRE_MINUTES,
+        fastapi_config.JWT_CLAIMS_EXPIRE_MINUTES,
+    )
+    return create_access_token(data=data, expires_delta=timedelta(minutes=expire_minutes))
+
+
+# 获取用户当前的token版本号（短时缓存，用户不存在时返回None）
+def get_token_version(session: Session, user_id: uuid.UUID) -> int | None:
+    version = token_version_cache.get(user_id)
+    if version is None:
+        statement = select(UserModel.token_version).where(UserModel.id == user_id)
+        version = session.exec(statement).first()
+        if version is None:
+            return None
+        token_version_cache.set(user_id, version)
+    return version
+
+
+# 吊销用户已签发的携带权限信息的token和全部刷新令牌（由调用方提交事务）
+def revoke_user_tokens(session: Session, user_id: uuid.UUID):
+    session.exec(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(token_version=UserModel.token_version + 1)
+    )
+    session.exec(delete(RefreshTokenModel).where(RefreshTokenModel.user_id == user_id))
+
+
+# 计算刷新令牌的摘要（数据库中只保存摘要）
+def _hash_refresh_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+# 签发刷新令牌（随机不透明字符串），同时清理该用户已过期的刷新令牌
+def create_refresh_token(session: Session, user_id: uuid.UUID) -> str:
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.now()
+    session.exec(
+        delete(RefreshTokenModel).where(
+            RefreshTokenModel.user_id == user_id,
+            RefreshTokenModel.expires_at < now,
+        )
+    )
+    session.add(
+        RefreshTokenModel(
+            user_id=user_id,
+            token_hash=_hash_refresh_token(refresh_token),
+            expires_at=now + timedelta(days=fastapi_config.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    session.commit()
+    return refresh_token
+
+
+# 使用刷新令牌换取新的访问令牌：旧刷新令牌在同一条语句中查找并作废（轮换），不涉及密码校验
+def refresh_access_token(session: Session, refresh_token: str) -> Token:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="刷新令牌无效或已过期",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        statement = (
+            delete(RefreshTokenModel)
+            .where(RefreshTokenModel.token_hash == _hash_refresh_token(refresh_token))
+            .returning(RefreshTokenModel.user_id, RefreshTokenModel.expires_at)
+        )
+        row = session.exec(statement).first()
+        if row is None or row.expires_at < datetime.now():
+            session.commit()
+            raise credentials_exception
+        user = session.get(UserModel, row.user_id)
+        if not user or not user.active:
+            session.commit()
+            raise credentials_exception
+        access_token = issue_access_token(session, user)
+        new_refresh_token = create_refresh_token(session, user.id)
+        return Token(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=new_refresh_token,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        session.rollback()
+        print(f"刷新令牌失败：{str(e)}")
+        raise HTTPException(status_code=500, detail="刷新令牌失败，请联系管理员！")
+
+
+# 用户权限发生变化并提交后调用，清空本进程的权限相关缓存
+def invalidate_auth_caches():
+    auth_context_cache.clear()
+    token_version_cache.clear()
+
+
+# 获取当前用户的权限上下文（按token短时缓存，同一请求内多次调用只查询一次）
+def get_auth_context(session: Session, token: str) -> AuthContext:
+    digest = _token_digest(token)
+    context = auth_context_cache.get(digest)
+    if context is not None:
+        return context
+    payload = decode_token(token)
+    try:
+        user_id = uuid.UUID(str(payload.get("sub")))
+    except ValueError:
+        user_id = None
+    # 携带权限信息的token只需校验版本号，无需查询权限相关的表
+    if user_id and "ver" in payload:
+        if get_token_version(session, user_id) != payload["ver"]:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="令牌已失效，请重新登录",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return _context_from_claims(user_id, payload)
+    context = load_auth_context(session, user_id) if user_id else None
+    if context is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="无法验证用户凭证",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # 缓存时间不超过token的剩余有效期
+    ttl = fastapi_config.AUTH_CONTEXT_CACHE_SECONDS
+    if payload.get("exp"):
+        ttl = min(ttl, payload["exp"] - datetime.now(timezone.utc).timestamp())
+    auth_context_cache.set(digest, context, ttl)
+    return context